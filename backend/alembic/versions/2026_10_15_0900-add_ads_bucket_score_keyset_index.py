@@ -0,0 +1,29 @@
+"""add ads (bucket_score, id) keyset pagination index
+
+Revision ID: add_ads_bucket_score_id_index
+Revises: add_google_ads_created_at
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_ads_bucket_score_id_index'
+down_revision = 'add_google_ads_created_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches the ads listing ORDER BY so keyset pages are index range scans
+    op.create_index(
+        'ix_ads_bucket_score_id',
+        'ads',
+        [sa.text('bucket_score DESC NULLS LAST'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ads_bucket_score_id', table_name='ads')
@@ -0,0 +1,42 @@
+"""add generated micros columns to ad_metrics_90d
+
+Revision ID: add_ad_metrics_90d_micros
+Revises: add_ads_bucket_score_id_index
+Create Date: 2026-10-15 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_ad_metrics_90d_micros'
+down_revision = 'add_ads_bucket_score_id_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stored generated columns so the API reads integer micros directly
+    op.add_column(
+        'ad_metrics_90d',
+        sa.Column(
+            'cost_per_conversion_micros',
+            sa.BigInteger(),
+            sa.Computed('(cost_per_conversion * 1000000)::bigint', persisted=True),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        'ad_metrics_90d',
+        sa.Column(
+            'average_cpc_micros',
+            sa.BigInteger(),
+            sa.Computed('(average_cpc * 1000000)::bigint', persisted=True),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('ad_metrics_90d', 'average_cpc_micros')
+    op.drop_column('ad_metrics_90d', 'cost_per_conversion_micros')
@@ -0,0 +1,37 @@
+"""store suggestion headlines/descriptions as plain JSON arrays
+
+Revision ID: normalize_suggestion_copy
+Revises: add_ad_metrics_90d_micros
+Create Date: 2026-10-15 09:20:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'normalize_suggestion_copy'
+down_revision = 'add_ad_metrics_90d_micros'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Unwrap legacy {"items": [...]} objects so both columns always hold arrays
+    for column in ('headlines', 'descriptions'):
+        op.execute(
+            f"""
+            UPDATE suggestions
+            SET {column} = COALESCE({column} -> 'items', '[]'::json)
+            WHERE json_typeof({column}) = 'object'
+            """
+        )
+
+
+def downgrade() -> None:
+    for column in ('headlines', 'descriptions'):
+        op.execute(
+            f"""
+            UPDATE suggestions
+            SET {column} = json_build_object('items', {column})
+            WHERE json_typeof({column}) = 'array'
+            """
+        )
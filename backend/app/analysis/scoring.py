@@ -1,10 +1,11 @@
 """Ad performance scoring and bucketing logic."""
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
@@ -14,7 +15,7 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ScoringConfig:
     """Configuration for ad scoring algorithm."""
 
@@ -31,108 +32,213 @@ class ScoringConfig:
     best_percentile: float = 0.80  # Top 20%
     worst_percentile: float = 0.20  # Bottom 20%
 
+    # (ctr, conversion_rate, cost_per_conversion, volume) weights, packed once
+    weights: tuple[float, float, float, float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            "weights",
+            (
+                self.weight_ctr,
+                self.weight_conversion_rate,
+                self.weight_cost_per_conversion,
+                self.weight_volume,
+            ),
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class AdScore:
-    """Ad performance score with explanation."""
+    """
+    Ad performance score with explanation.
+
+    The explanation is rendered from the component scores on first access, so
+    ads whose explanation is never shown don't pay for the string formatting.
+    """
 
     ad_id: int
     score: float
     bucket: AdBucket
-    explanation: str
     metrics: dict
+    # (ctr, cvr, cost, volume) component scores for scored ads
+    components: Optional[tuple[float, float, float, float]] = None
+    # Fixed explanation for ads that didn't meet the volume thresholds
+    reason: Optional[str] = None
+    _explanation: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def explanation(self) -> str:
+        if self._explanation is None:
+            self._explanation = self.reason if self.reason is not None else self._render()
+        return self._explanation
+
+    def _render(self) -> str:
+        ctr_score, cvr_score, cost_score, volume_score = self.components
+        ctr = self.metrics["ctr"]
+        conversion_rate = self.metrics["conversion_rate"]
+        cost_per_conversion = self.metrics["cost_per_conversion"]
+
+        explanation_parts = [
+            f"CTR: {ctr:.2f}% (score: {ctr_score:.2f})",
+            f"CVR: {conversion_rate:.2f}% (score: {cvr_score:.2f})",
+            (
+                f"CPA: ${cost_per_conversion:.2f} (score: {cost_score:.2f})"
+                if cost_per_conversion
+                else "CPA: N/A"
+            ),
+            f"Volume: {self.metrics['impressions']:,} imp (score: {volume_score:.2f})",
+            f"Composite: {self.score:.3f}",
+        ]
+        return " | ".join(explanation_parts)
 
     def __lt__(self, other: "AdScore") -> bool:
         """Enable sorting by score."""
         return self.score < other.score
 
 
-def compute_ad_score(ad: Ad, metrics: AdMetrics90d, config: ScoringConfig) -> Optional[AdScore]:
+@dataclass
+class ScoreBatch:
+    """Score components for a batch of ads, one array element per ad."""
+
+    meets_impressions: np.ndarray  # bool
+    meets_clicks: np.ndarray  # bool
+    ctr_score: np.ndarray
+    cvr_score: np.ndarray
+    cost_score: np.ndarray
+    volume_score: np.ndarray
+    score: np.ndarray  # Composite; 0.0 where volume thresholds aren't met
+
+
+def compute_ad_scores_batch(
+    impressions, clicks, ctr, conversion_rate, cost_per_conversion, config: ScoringConfig
+) -> ScoreBatch:
     """
-    Compute composite performance score for an ad.
+    Compute composite performance scores for many ads in a few NumPy operations.
 
-    Returns None if ad doesn't meet minimum volume thresholds.
+    Takes column sequences with one element per ad. Missing ctr, conversion_rate
+    or cost_per_conversion values may be None.
     """
+    impressions = np.asarray(impressions, dtype=np.float64)
+    clicks = np.asarray(clicks, dtype=np.float64)
+    ctr = np.nan_to_num(np.asarray(ctr, dtype=np.float64))
+    conversion_rate = np.nan_to_num(np.asarray(conversion_rate, dtype=np.float64))
+    cost_per_conversion = np.nan_to_num(np.asarray(cost_per_conversion, dtype=np.float64))
+
+    meets_impressions = impressions >= config.min_impressions
+    meets_clicks = clicks >= config.min_clicks
+
+    # Normalize cost_per_conversion (lower is better, so invert; cap at $500).
+    # No conversions = 0 score for this component
+    cost_score = np.where(
+        cost_per_conversion > 0, np.maximum(0.0, 1 - cost_per_conversion / 500.0), 0.0
+    )
+
+    # Normalize CTR and conversion rate (typical range 0-20%)
+    ctr_score = np.minimum(1.0, ctr / 20.0)
+    cvr_score = np.minimum(1.0, conversion_rate / 20.0)
+
+    # Volume score on log scale (10^6 = max)
+    volume_score = np.minimum(1.0, np.log10(np.maximum(impressions, 1.0)) / 6.0)
+
+    # Compute weighted composite score
+    w_ctr, w_cvr, w_cpa, w_vol = config.weights
+    composite_score = (
+        w_ctr * ctr_score + w_cvr * cvr_score + w_cpa * cost_score + w_vol * volume_score
+    )
+
+    return ScoreBatch(
+        meets_impressions=meets_impressions,
+        meets_clicks=meets_clicks,
+        ctr_score=ctr_score,
+        cvr_score=cvr_score,
+        cost_score=cost_score,
+        volume_score=volume_score,
+        score=np.where(meets_impressions & meets_clicks, composite_score, 0.0),
+    )
+
+
+def _batch_components(batch: ScoreBatch):
+    """Iterate per-ad component tuples in the order _build_ad_score unpacks them."""
+    return zip(
+        batch.meets_impressions,
+        batch.meets_clicks,
+        batch.ctr_score,
+        batch.cvr_score,
+        batch.cost_score,
+        batch.volume_score,
+        batch.score,
+    )
+
+
+def _build_ad_score(
+    ad_id: int, metrics, config: ScoringConfig, components: tuple
+) -> AdScore:
+    """Build the AdScore from one ad's score components."""
+    (
+        meets_impressions,
+        meets_clicks,
+        ctr_score,
+        cvr_score,
+        cost_score,
+        volume_score,
+        composite_score,
+    ) = components
+
     # Check minimum thresholds
-    if metrics.impressions < config.min_impressions:
+    if not meets_impressions:
         return AdScore(
-            ad_id=ad.id,
+            ad_id=ad_id,
             score=0.0,
             bucket=AdBucket.UNKNOWN,
-            explanation=f"Insufficient impressions ({metrics.impressions} < {config.min_impressions})",
             metrics={},
+            reason=f"Insufficient impressions ({metrics.impressions} < {config.min_impressions})",
         )
 
-    if metrics.clicks < config.min_clicks:
+    if not meets_clicks:
         return AdScore(
-            ad_id=ad.id,
+            ad_id=ad_id,
             score=0.0,
             bucket=AdBucket.UNKNOWN,
-            explanation=f"Insufficient clicks ({metrics.clicks} < {config.min_clicks})",
             metrics={},
+            reason=f"Insufficient clicks ({metrics.clicks} < {config.min_clicks})",
         )
 
-    # Extract metrics
-    ctr = metrics.ctr or 0.0
-    conversion_rate = metrics.conversion_rate or 0.0
-    cost_per_conversion = metrics.cost_per_conversion
-
-    # Normalize cost_per_conversion (lower is better, so invert)
-    # Use 0 if no conversions
-    if cost_per_conversion and cost_per_conversion > 0:
-        # Inverse normalized score (0-1 range)
-        # Cap at $500 for normalization
-        cost_score = max(0, 1 - (cost_per_conversion / 500.0))
-    else:
-        # No conversions = 0 score for this component
-        cost_score = 0.0
-
-    # Normalize CTR (typical range 0-20%)
-    ctr_score = min(1.0, ctr / 20.0)
-
-    # Normalize conversion rate (typical range 0-20%)
-    cvr_score = min(1.0, conversion_rate / 20.0)
-
-    # Volume score (log scale to handle wide range)
-    # Normalize impressions on log scale
-    import math
-
-    volume_score = min(1.0, math.log10(metrics.impressions) / 6.0)  # 10^6 = max
-
-    # Compute weighted composite score
-    composite_score = (
-        config.weight_ctr * ctr_score
-        + config.weight_conversion_rate * cvr_score
-        + config.weight_cost_per_conversion * cost_score
-        + config.weight_volume * volume_score
-    )
-
-    # Build explanation
-    explanation_parts = [
-        f"CTR: {ctr:.2f}% (score: {ctr_score:.2f})",
-        f"CVR: {conversion_rate:.2f}% (score: {cvr_score:.2f})",
-        f"CPA: ${cost_per_conversion:.2f} (score: {cost_score:.2f})" if cost_per_conversion else "CPA: N/A",
-        f"Volume: {metrics.impressions:,} imp (score: {volume_score:.2f})",
-        f"Composite: {composite_score:.3f}",
-    ]
-    explanation = " | ".join(explanation_parts)
-
     return AdScore(
-        ad_id=ad.id,
-        score=composite_score,
+        ad_id=ad_id,
+        score=float(composite_score),
         bucket=AdBucket.UNKNOWN,  # Set later after percentile calculation
-        explanation=explanation,
         metrics={
             "impressions": metrics.impressions,
             "clicks": metrics.clicks,
-            "ctr": ctr,
-            "conversion_rate": conversion_rate,
-            "cost_per_conversion": cost_per_conversion,
+            "ctr": metrics.ctr or 0.0,
+            "conversion_rate": metrics.conversion_rate or 0.0,
+            "cost_per_conversion": metrics.cost_per_conversion,
             "conversions": metrics.conversions,
         },
+        components=(ctr_score, cvr_score, cost_score, volume_score),
     )
 
 
+def compute_ad_score(ad: Ad, metrics: AdMetrics90d, config: ScoringConfig) -> Optional[AdScore]:
+    """
+    Compute composite performance score for an ad.
+
+    Scores a one-row batch so there is a single implementation of the formula.
+    Ads below the minimum volume thresholds get a 0.0 UNKNOWN score.
+    """
+    batch = compute_ad_scores_batch(
+        [metrics.impressions],
+        [metrics.clicks],
+        [metrics.ctr],
+        [metrics.conversion_rate],
+        [metrics.cost_per_conversion],
+        config,
+    )
+    (components,) = _batch_components(batch)
+    return _build_ad_score(ad.id, metrics, config, components)
+
+
 def classify_ads_by_performance(
     db: Session, account_id: int, config: Optional[ScoringConfig] = None
 ) -> dict:
@@ -146,9 +252,17 @@ def classify_ads_by_performance(
 
     logger.info(f"Classifying ads for account {account_id}")
 
-    # Get all ads with metrics for this account
+    # Get scoring columns for all ads with metrics for this account
     query = (
-        select(Ad, AdMetrics90d)
+        select(
+            Ad.id,
+            AdMetrics90d.impressions,
+            AdMetrics90d.clicks,
+            AdMetrics90d.ctr,
+            AdMetrics90d.conversion_rate,
+            AdMetrics90d.cost_per_conversion,
+            AdMetrics90d.conversions,
+        )
         .join(AdMetrics90d, Ad.id == AdMetrics90d.ad_id)
         .join(AdGroup, Ad.ad_group_id == AdGroup.id)
         .join(Campaign, AdGroup.campaign_id == Campaign.id)
@@ -159,13 +273,18 @@ def classify_ads_by_performance(
     results = db.execute(query).all()
     logger.info(f"Found {len(results)} ads with metrics for account {account_id}")
 
-    # Compute scores for all ads
+    # Compute scores for all ads in one vectorized batch
     # Always do relative classification, even if ads don't meet thresholds
     all_scores = []
-    for ad, metrics in results:
-        score = compute_ad_score(ad, metrics, config)
-        if score:
-            all_scores.append(score)
+    if results:
+        _, impressions, clicks, ctr, conversion_rate, cost_per_conversion, _ = zip(*results)
+        batch = compute_ad_scores_batch(
+            impressions, clicks, ctr, conversion_rate, cost_per_conversion, config
+        )
+        all_scores = [
+            _build_ad_score(row.id, row, config, c)
+            for row, c in zip(results, _batch_components(batch))
+        ]
     
     if not all_scores:
         logger.warning(f"No ads with metrics found for account {account_id}")
@@ -199,41 +318,44 @@ def classify_ads_by_performance(
         best_threshold_idx = max(1, mid_point)
         worst_threshold_idx = max(1, len(scored_ads) - mid_point)
 
-    # Classify into buckets
+    # Classify into buckets by position in the sorted list: [best | unknown | worst].
+    # Worst starts no earlier than the end of best (if an ad is in both, prefer best)
+    worst_start = max(best_threshold_idx, len(scored_ads) - worst_threshold_idx)
     best_ads = scored_ads[:best_threshold_idx]
-    worst_ads = scored_ads[-worst_threshold_idx:]
-    
-    # Remove overlap (if an ad is in both, prefer best)
-    worst_ads = [ad for ad in worst_ads if ad not in best_ads]
-    
-    # Remaining ads go to unknown
-    remaining_ads = [ad for ad in scored_ads if ad not in best_ads and ad not in worst_ads]
-    unknown_ads = remaining_ads
+    unknown_ads = scored_ads[best_threshold_idx:worst_start]
+    worst_ads = scored_ads[worst_start:]
 
-    # Update database
+    # Update database: one bulk UPDATE by primary key instead of a SELECT + UPDATE per ad
+    bucket_rows = []
     for score in best_ads:
         score.bucket = AdBucket.BEST
-        ad = db.query(Ad).filter(Ad.id == score.ad_id).first()
-        if ad:
-            ad.bucket = AdBucket.BEST
-            ad.bucket_score = score.score
-            ad.bucket_explanation = f"TOP {config.best_percentile*100:.0f}% | {score.explanation}"
+        bucket_rows.append({
+            "id": score.ad_id,
+            "bucket": AdBucket.BEST,
+            "bucket_score": score.score,
+            "bucket_explanation": f"TOP {config.best_percentile*100:.0f}% | {score.explanation}",
+        })
 
     for score in worst_ads:
         score.bucket = AdBucket.WORST
-        ad = db.query(Ad).filter(Ad.id == score.ad_id).first()
-        if ad:
-            ad.bucket = AdBucket.WORST
-            ad.bucket_score = score.score
-            ad.bucket_explanation = f"BOTTOM {config.worst_percentile*100:.0f}% | {score.explanation}"
+        bucket_rows.append({
+            "id": score.ad_id,
+            "bucket": AdBucket.WORST,
+            "bucket_score": score.score,
+            "bucket_explanation": (
+                f"BOTTOM {config.worst_percentile*100:.0f}% | {score.explanation}"
+            ),
+        })
 
     for score in unknown_ads:
-        ad = db.query(Ad).filter(Ad.id == score.ad_id).first()
-        if ad:
-            ad.bucket = AdBucket.UNKNOWN
-            ad.bucket_score = score.score
-            ad.bucket_explanation = score.explanation
-
+        bucket_rows.append({
+            "id": score.ad_id,
+            "bucket": AdBucket.UNKNOWN,
+            "bucket_score": score.score,
+            "bucket_explanation": score.explanation,
+        })
+
+    db.execute(update(Ad), bucket_rows)
     db.commit()
 
     result = {
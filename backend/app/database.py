@@ -1,7 +1,9 @@
 """Database configuration and session management."""
 
+from functools import lru_cache
 from typing import AsyncGenerator
 
+from redis import Redis
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
@@ -61,3 +63,9 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     """Get async database session for FastAPI endpoints."""
     async with AsyncSessionLocal() as session:
         yield session
+
+
+@lru_cache
+def get_redis() -> Redis:
+    """Get shared Redis client (same Redis instance as the Celery broker)."""
+    return Redis.from_url(settings.redis_url_str)
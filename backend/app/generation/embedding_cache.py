@@ -0,0 +1,80 @@
+"""Content-addressed Redis cache for ad copy embeddings."""
+
+import hashlib
+import logging
+from typing import Callable, Optional
+
+import numpy as np
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.database import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Cache embeddings in Redis keyed by (model, hash of ad text).
+
+    Vectors are stored as raw float32 bytes. Redis failures degrade to
+    computing every embedding rather than failing the request.
+    """
+
+    KEY_PREFIX = "emb"
+    TTL_SECONDS = 30 * 24 * 3600  # Ad copy is immutable per hash; expire to bound memory
+
+    def __init__(self, redis_client: Optional[Redis] = None):
+        """Initialize with a Redis client (defaults to the shared one)."""
+        self.redis = redis_client if redis_client is not None else get_redis()
+
+    def _key(self, model: str, text: str) -> str:
+        digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        return f"{self.KEY_PREFIX}:{model}:{digest}"
+
+    def get_or_compute_many(
+        self,
+        texts: list[str],
+        model: str,
+        embed_batch: Callable[[list[str]], list[Optional[np.ndarray]]],
+    ) -> list[Optional[np.ndarray]]:
+        """
+        Return embeddings for texts, computing only the cache misses.
+
+        embed_batch is called once with the missing texts and must return a
+        list of the same length (None for failures, which are not cached).
+        """
+        if not texts:
+            return []
+
+        keys = [self._key(model, text) for text in texts]
+        try:
+            cached = self.redis.mget(keys)
+        except RedisError as e:
+            logger.warning(f"Embedding cache unavailable, computing all embeddings: {e}")
+            cached = [None] * len(texts)
+
+        embeddings: list[Optional[np.ndarray]] = [
+            np.frombuffer(raw, dtype=np.float32) if raw is not None else None for raw in cached
+        ]
+        missing = [i for i, emb in enumerate(embeddings) if emb is None]
+
+        if missing:
+            computed = embed_batch([texts[i] for i in missing])
+            to_cache = {}
+            for i, emb in zip(missing, computed):
+                if emb is not None:
+                    embeddings[i] = np.asarray(emb, dtype=np.float32)
+                    to_cache[keys[i]] = embeddings[i].tobytes()
+
+            if to_cache:
+                try:
+                    pipe = self.redis.pipeline(transaction=False)
+                    for key, raw in to_cache.items():
+                        pipe.set(key, raw, ex=self.TTL_SECONDS)
+                    pipe.execute()
+                except RedisError as e:
+                    logger.warning(f"Failed to write embeddings to cache: {e}")
+
+        logger.info(f"Embedding cache: {len(texts) - len(missing)}/{len(texts)} hits")
+        return embeddings
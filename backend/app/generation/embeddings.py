@@ -8,12 +8,32 @@ from openai import OpenAI
 from sklearn.metrics.pairwise import cosine_similarity
 
 from app.config import get_settings
+from app.generation.embedding_cache import EmbeddingCache
 from app.models import Ad
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row (as float32) so cosine similarity is a plain dot product."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top-k scores, best first, via argpartition rather than a full sort."""
+    if top_k <= 0 or len(scores) == 0:
+        return np.empty(0, dtype=np.intp)
+    if top_k < len(scores):
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
 class EmbeddingsService:
     """Service for generating and comparing ad copy embeddings."""
 
@@ -74,41 +94,55 @@ class EmbeddingsService:
     def find_most_similar(
         self,
         query_embedding: np.ndarray,
-        candidate_embeddings: list[np.ndarray],
+        candidate_embeddings: list[np.ndarray] | np.ndarray,
         top_k: int = 5,
+        candidates_normalized: bool = False,
     ) -> list[tuple[int, float]]:
         """
         Find top-k most similar embeddings to query.
 
+        Pass candidates_normalized=True when the candidate rows are already
+        L2-normalized (e.g. from embed_best_ads) to skip re-normalizing them.
+
         Returns list of (index, similarity_score) tuples.
         """
-        if not candidate_embeddings:
+        if len(candidate_embeddings) == 0:
             return []
 
-        # Stack embeddings into matrix
-        candidates_matrix = np.vstack(candidate_embeddings)
-        query_matrix = query_embedding.reshape(1, -1)
+        # Stack embeddings into a row-normalized matrix
+        candidates_matrix = np.asarray(candidate_embeddings, dtype=np.float32)
+        if not candidates_normalized:
+            candidates_matrix = normalize_rows(candidates_matrix)
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm > 0:
+            query = query / query_norm
 
-        # Compute all similarities at once
-        similarities = cosine_similarity(query_matrix, candidates_matrix)[0]
+        # Cosine similarities as one matrix-vector product
+        similarities = candidates_matrix @ query
 
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
+        top_indices = top_k_indices(similarities, top_k)
 
         results = [(int(idx), float(similarities[idx])) for idx in top_indices]
         return results
 
 
-def embed_best_ads(ads: list[Ad]) -> tuple[list[Ad], list[np.ndarray]]:
+def embed_best_ads(ads: list[Ad]) -> tuple[list[Ad], np.ndarray]:
     """
     Generate embeddings for a list of best-performing ads.
 
     Returns (ads, embeddings) with same length, filtering out any failures.
+    Embeddings are a float32 matrix with L2-normalized rows, one per ad.
     """
     service = EmbeddingsService()
+    cache = EmbeddingCache()
 
     texts = [service.extract_ad_text(ad) for ad in ads]
-    embeddings = service.generate_embeddings_batch(texts)
+    # Only cache misses hit the embedding model
+    embeddings = cache.get_or_compute_many(
+        texts, service.embedding_model, service.generate_embeddings_batch
+    )
 
     # Filter out failed embeddings
     valid_ads = []
@@ -122,22 +156,35 @@ def embed_best_ads(ads: list[Ad]) -> tuple[list[Ad], list[np.ndarray]]:
             logger.warning(f"Skipping ad {ad.id} due to embedding failure")
 
     logger.info(f"Generated embeddings for {len(valid_ads)}/{len(ads)} best ads")
-    return valid_ads, valid_embeddings
+    if not valid_embeddings:
+        return valid_ads, np.empty((0, service.embedding_dimensions), dtype=np.float32)
+    # Normalize once here so every similarity query is a single matmul
+    return valid_ads, normalize_rows(np.vstack(valid_embeddings))
+
+
+def embed_ad(ad: Ad) -> Optional[np.ndarray]:
+    """Generate (or fetch cached) embedding for a single ad."""
+    service = EmbeddingsService()
+    [embedding] = EmbeddingCache().get_or_compute_many(
+        [service.extract_ad_text(ad)], service.embedding_model, service.generate_embeddings_batch
+    )
+    return embedding
 
 
 def retrieve_exemplars_for_ad(
-    target_ad: Ad, best_ads: list[Ad], best_embeddings: list[np.ndarray], top_k: int = 5
+    target_ad: Ad, best_ads: list[Ad], best_embeddings: np.ndarray, top_k: int = 5
 ) -> list[tuple[Ad, float]]:
     """
     Retrieve top-k most similar best-performing ads as exemplars.
 
+    best_embeddings is the row-normalized matrix returned by embed_best_ads.
+
     Returns list of (ad, similarity_score) tuples.
     """
     service = EmbeddingsService()
 
-    # Generate embedding for target ad
-    target_text = service.extract_ad_text(target_ad)
-    target_embedding = service.generate_embedding(target_text)
+    # Generate embedding for target ad (cached by ad text)
+    target_embedding = embed_ad(target_ad)
 
     if target_embedding is None:
         logger.error(f"Failed to generate embedding for target ad {target_ad.id}")
@@ -145,7 +192,7 @@ def retrieve_exemplars_for_ad(
 
     # Find most similar
     similar_indices = service.find_most_similar(
-        target_embedding, best_embeddings, top_k=top_k
+        target_embedding, best_embeddings, top_k=top_k, candidates_normalized=True
     )
 
     exemplars = [(best_ads[idx], score) for idx, score in similar_indices]
@@ -0,0 +1,134 @@
+"""Per-account exemplar index of best-ad embeddings, persisted in Redis."""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from redis import Redis
+from sqlalchemy.orm import Session
+
+from app.analysis.scoring import get_best_ads
+from app.database import get_redis
+from app.generation.embeddings import embed_best_ads, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+# Matches the exemplar pool size previously used by the /generate endpoint
+EXEMPLAR_POOL_SIZE = 20
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize float vectors to int8 with one symmetric scale per row.
+
+    Returns (codes, scales) such that vectors ~= codes * scales[:, None].
+    """
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.round(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+@dataclass
+class ExemplarIndex:
+    """Best-ad embeddings for one account, L2-normalized and int8-quantized per row."""
+
+    account_id: int
+    ad_ids: np.ndarray  # int64, shape (n,)
+    codes: np.ndarray  # int8, shape (n, dim)
+    scales: np.ndarray  # float32, shape (n,)
+
+    def search(self, query: np.ndarray, top_k: int = 5) -> list[tuple[int, float]]:
+        """
+        Find the top-k most similar exemplar ads to the query embedding.
+
+        Returns list of (ad_id, similarity_score) tuples, best first.
+        """
+        if len(self.ad_ids) == 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        # Cosine against the int8 rows, rescaled per row
+        scores = (self.codes @ (query / norm)) * self.scales
+        top_indices = top_k_indices(scores, top_k)
+        return [(int(self.ad_ids[i]), float(scores[i])) for i in top_indices]
+
+
+def _index_key(account_id: int) -> str:
+    return f"exemplar_index:{account_id}"
+
+
+def save_exemplar_index(index: ExemplarIndex, redis_client: Optional[Redis] = None) -> None:
+    """Persist an exemplar index, replacing any previous one for the account."""
+    redis_client = redis_client if redis_client is not None else get_redis()
+    key = _index_key(index.account_id)
+    pipe = redis_client.pipeline()
+    pipe.delete(key)
+    pipe.hset(
+        key,
+        mapping={
+            "dim": index.codes.shape[1],
+            "ad_ids": index.ad_ids.astype(np.int64).tobytes(),
+            "codes": index.codes.astype(np.int8).tobytes(),
+            "scales": index.scales.astype(np.float32).tobytes(),
+        },
+    )
+    pipe.execute()
+
+
+def load_exemplar_index(
+    account_id: int, redis_client: Optional[Redis] = None
+) -> Optional[ExemplarIndex]:
+    """Load the persisted exemplar index for an account, or None if not built."""
+    redis_client = redis_client if redis_client is not None else get_redis()
+    data = redis_client.hgetall(_index_key(account_id))
+    if b"codes" not in data:
+        # Not built yet (or stored in the old float32 layout): treat as missing
+        return None
+
+    dim = int(data[b"dim"])
+    return ExemplarIndex(
+        account_id=account_id,
+        ad_ids=np.frombuffer(data[b"ad_ids"], dtype=np.int64),
+        codes=np.frombuffer(data[b"codes"], dtype=np.int8).reshape(-1, dim),
+        scales=np.frombuffer(data[b"scales"], dtype=np.float32),
+    )
+
+
+def build_exemplar_index(
+    db: Session, account_id: int, redis_client: Optional[Redis] = None
+) -> Optional[ExemplarIndex]:
+    """
+    Embed the account's best ads and persist them as its exemplar index.
+
+    Run after scoring so the index reflects the current BEST bucket.
+    Returns None (and drops any stale index) if there are no usable best ads.
+    """
+    redis_client = redis_client if redis_client is not None else get_redis()
+
+    best_ads = get_best_ads(db, account_id, limit=EXEMPLAR_POOL_SIZE)
+    ads, vectors = embed_best_ads(best_ads) if best_ads else ([], None)
+
+    if not ads:
+        redis_client.delete(_index_key(account_id))
+        logger.info(f"No best ads to index for account {account_id}")
+        return None
+
+    # Rows come back L2-normalized from embed_best_ads
+    codes, scales = quantize_int8(vectors)
+
+    index = ExemplarIndex(
+        account_id=account_id,
+        ad_ids=np.array([ad.id for ad in ads], dtype=np.int64),
+        codes=codes,
+        scales=scales,
+    )
+    save_exemplar_index(index, redis_client)
+
+    logger.info(f"Built exemplar index for account {account_id} with {len(ads)} ads")
+    return index
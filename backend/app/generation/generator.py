@@ -1,10 +1,14 @@
 """Ad copy generation with OpenAI and RSA constraints."""
 
+import enum
+import functools
 import logging
-from dataclasses import dataclass
+import re
+import sys
+from dataclasses import dataclass, field
 from typing import Optional
 
-from openai import OpenAI
+from openai import BadRequestError, OpenAI
 
 from app.config import get_settings
 from app.models import Ad
@@ -12,6 +16,11 @@ from app.models import Ad
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+_SYSTEM_PROMPT = (
+    "You are an expert Google Ads copywriter specializing in Responsive Search Ads. "
+    "Your goal is to create compelling, conversion-focused ad copy that follows RSA best practices."
+)
+
 
 @dataclass
 class RSAConstraints:
@@ -26,7 +35,163 @@ class RSAConstraints:
     require_unique: bool = True  # Headlines and descriptions must be unique
 
 
-@dataclass
+def _render_constraints_block(c: RSAConstraints) -> str:
+    """Render the prompt's constraints section for a set of RSA constraints."""
+    return "\n".join((
+        "**Strict Constraints:**",
+        f"- Each headline: maximum {c.max_headline_length} characters",
+        f"- Each description: maximum {c.max_description_length} characters",
+        f"- Provide {c.min_headlines}-{c.max_headlines} headlines per variant",
+        f"- Provide {c.min_descriptions}-{c.max_descriptions} descriptions per variant",
+        "- All headlines must be unique (no duplicates)",
+        "- All descriptions must be unique (no duplicates)",
+    ))
+
+
+# Static prompt sections, rendered once at import
+_DEFAULT_CONSTRAINTS = RSAConstraints()
+_CONSTRAINTS_BLOCK = _render_constraints_block(_DEFAULT_CONSTRAINTS)
+
+_PROMPT_INTRO = (
+    "\nI need to improve a low-performing Google Responsive Search Ad (RSA). Below are the "
+    "rules for the new copy, examples of high-performing ads from the same account, and "
+    "finally the current ad copy.\n"
+)
+
+_TASK_GOALS = """1. Learn from the patterns and messaging in high-performing examples
+2. Maintain similar tone, value propositions, and keyword usage
+3. Improve upon the current ad's weaknesses
+4. Follow RSA best practices (clear CTA, benefits-focused, specific)
+"""
+
+_OUTPUT_FORMAT_BLOCK = """**Output Format:**
+For each variant, output exactly like this:
+
+VARIANT 1
+HEADLINES:
+- [Headline 1]
+- [Headline 2]
+- [Headline 3]
+...
+DESCRIPTIONS:
+- [Description 1]
+- [Description 2]
+...
+
+VARIANT 2
+...
+
+Be specific, compelling, and ensure all constraints are met.
+"""
+
+
+@functools.lru_cache(maxsize=16)
+def _variant_instruction(num_variants: int) -> str:
+    return f"Generate {num_variants} improved RSA variants that:"
+
+
+def _intern_text(text: str, max_len: int) -> str:
+    """Intern ad text that fits an RSA field; longer (invalid) text is left as-is."""
+    return sys.intern(text) if len(text) <= max_len else text
+
+
+def _ad_copy(ad: Ad) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Extract (headlines, descriptions) text from an ad's JSON asset lists.
+
+    Short texts are interned: accounts reuse the same phrases ("Free Trial", brand names)
+    across thousands of ads, so they share one string and compare by identity.
+    """
+    max_h = _DEFAULT_CONSTRAINTS.max_headline_length
+    max_d = _DEFAULT_CONSTRAINTS.max_description_length
+    headlines = tuple(
+        _intern_text(h.get("text", ""), max_h)
+        for h in (ad.headlines or [])
+        if isinstance(h, dict)
+    )
+    descriptions = tuple(
+        _intern_text(d.get("text", ""), max_d)
+        for d in (ad.descriptions or [])
+        if isinstance(d, dict)
+    )
+    return headlines, descriptions
+
+
+@functools.lru_cache(maxsize=256)
+def _render_exemplars(exemplars: tuple) -> str:
+    """
+    Render the exemplar section of the prompt.
+
+    exemplars is a tuple of (headlines, descriptions, similarity) per ad, so
+    target ads sharing an exemplar set reuse one rendered block.
+    """
+    return "\n\n".join(
+        f"High-Performing Example {i} (similarity: {score:.2f}):\n"
+        f"Headlines: {', '.join(headlines[:5])}\n"
+        f"Descriptions: {', '.join(descriptions[:2])}"
+        for i, (headlines, descriptions, score) in enumerate(exemplars, 1)
+    )
+
+
+_BATCH_PROMPT_INTRO = (
+    "\nI need to improve several low-performing Google Responsive Search Ads (RSAs). Below are "
+    "the rules for the new copy, a pool of high-performing ads from the same account (E1, E2, "
+    "...), and then one <task> per ad naming the examples to learn from and its current copy.\n"
+)
+
+_BATCH_OUTPUT_INSTRUCTIONS = (
+    "Answer every task. Wrap the variants for each task in <output id=\"ID\"> ... </output>, "
+    "using that task's id, and restart VARIANT numbering at 1 inside each output.\n"
+)
+
+_BATCH_OUTPUT_RE = re.compile(r'<output id="(\d+)">(.*?)</output>', re.DOTALL)
+
+
+def _split_batch_outputs(generated_text: str) -> dict[int, str]:
+    """Split a batched completion into per-task output text keyed by task (ad) id."""
+    return {int(task_id): body for task_id, body in _BATCH_OUTPUT_RE.findall(generated_text)}
+
+
+# Characters that are never valid inside an RSA asset; parsed copy maps them to spaces
+_FORBIDDEN_CHARS = str.maketrans("\n\t\r", "   ")
+
+
+class ValidationFlag(enum.IntFlag):
+    """RSA constraint violations, one bit per kind."""
+
+    TOO_FEW_HEADLINES = 1 << 0
+    TOO_MANY_HEADLINES = 1 << 1
+    TOO_FEW_DESCRIPTIONS = 1 << 2
+    TOO_MANY_DESCRIPTIONS = 1 << 3
+    HEADLINE_TOO_LONG = 1 << 4
+    DESCRIPTION_TOO_LONG = 1 << 5
+    DUPLICATE_HEADLINES = 1 << 6
+    DUPLICATE_DESCRIPTIONS = 1 << 7
+
+
+# Validation error templates, %-formatted only when messages are read
+_ERROR_TEMPLATES = {
+    ValidationFlag.TOO_FEW_HEADLINES: "Too few headlines: %d < %d",
+    ValidationFlag.TOO_MANY_HEADLINES: "Too many headlines: %d > %d",
+    ValidationFlag.TOO_FEW_DESCRIPTIONS: "Too few descriptions: %d < %d",
+    ValidationFlag.TOO_MANY_DESCRIPTIONS: "Too many descriptions: %d > %d",
+    ValidationFlag.HEADLINE_TOO_LONG: "Headline %d too long: %d > %d",
+    ValidationFlag.DESCRIPTION_TOO_LONG: "Description %d too long: %d > %d",
+    ValidationFlag.DUPLICATE_HEADLINES: "Headlines contain duplicates: %r",
+    ValidationFlag.DUPLICATE_DESCRIPTIONS: "Descriptions contain duplicates: %r",
+}
+
+
+def _first_duplicate(items: list[str]) -> Optional[str]:
+    """Return the first item that repeats an earlier one, or None if all are unique."""
+    seen = set()
+    for item in items:
+        if item in seen:
+            return item
+        seen.add(item)
+    return None
+
+
+@dataclass(slots=True)
 class GeneratedRSA:
     """Generated RSA with metadata."""
 
@@ -37,17 +202,33 @@ class GeneratedRSA:
     exemplar_ids: list[int]
     similarity_scores: list[float]
     valid: bool = True
-    validation_errors: list[str] = None
-
-    def __post_init__(self):
-        if self.validation_errors is None:
-            self.validation_errors = []
+    error_flags: ValidationFlag = field(default=ValidationFlag(0), init=False)
+    # (flag, template args) per violation, in check order
+    _error_details: list[tuple[ValidationFlag, tuple]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    @property
+    def validation_errors(self) -> list[str]:
+        """Human-readable validation errors, rendered on access."""
+        return [_ERROR_TEMPLATES[flag] % args for flag, args in self._error_details]
+
+    def set_validation_result(self, details: list[tuple[ValidationFlag, tuple]]) -> None:
+        """Record the (flag, template args) violations found by validation."""
+        flags = ValidationFlag(0)
+        for flag, _ in details:
+            flags |= flag
+        self.error_flags = flags
+        self._error_details = details
+        self.valid = not details
 
 
 class RSAGenerator:
     """Generate RSA-compliant ad copy using OpenAI with exemplar bias."""
 
-    PROMPT_VERSION = "v1.0"
+    PROMPT_VERSION = "v1.1"
+    BATCH_SIZE = 8  # Target ads per batched completion
+    MAX_BATCH_OUTPUT_TOKENS = 16000
 
     def __init__(self):
         """Initialize OpenAI client."""
@@ -84,11 +265,7 @@ class RSAGenerator:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Google Ads copywriter specializing in Responsive Search Ads. "
-                        "Your goal is to create compelling, conversion-focused ad copy that follows RSA best practices.",
-                    },
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.8,  # More creative
@@ -115,94 +292,212 @@ class RSAGenerator:
             logger.error(f"Failed to generate suggestions for ad {target_ad.id}: {e}")
             return []
 
-    def _build_prompt(
+    def generate_batch(
         self,
-        target_ad: Ad,
-        exemplar_ads: list[tuple[Ad, float]],
-        num_variants: int,
-    ) -> str:
-        """Build prompt with exemplars and constraints."""
-        # Extract current ad copy
-        current_headlines = []
-        current_descriptions = []
-
-        if target_ad.headlines:
-            current_headlines = [
-                h.get("text", "") for h in target_ad.headlines if isinstance(h, dict)
-            ]
-        if target_ad.descriptions:
-            current_descriptions = [
-                d.get("text", "") for d in target_ad.descriptions if isinstance(d, dict)
-            ]
-
-        # Extract exemplar copy
-        exemplar_texts = []
-        for i, (ad, score) in enumerate(exemplar_ads[:5], 1):
-            ex_headlines = []
-            ex_descriptions = []
-
-            if ad.headlines:
-                ex_headlines = [
-                    h.get("text", "") for h in ad.headlines if isinstance(h, dict)
-                ]
-            if ad.descriptions:
-                ex_descriptions = [
-                    d.get("text", "") for d in ad.descriptions if isinstance(d, dict)
-                ]
-
-            exemplar_texts.append(
-                f"High-Performing Example {i} (similarity: {score:.2f}):\n"
-                f"Headlines: {', '.join(ex_headlines[:5])}\n"
-                f"Descriptions: {', '.join(ex_descriptions[:2])}"
-            )
+        target_ads: list[Ad],
+        exemplars_per_ad: list[list[tuple[Ad, float]]],
+        num_variants: int = 3,
+    ) -> dict[int, list[GeneratedRSA]]:
+        """
+        Generate RSA suggestions for several target ads with one completion per batch.
 
-        exemplars_section = "\n\n".join(exemplar_texts)
+        Ads are sent BATCH_SIZE at a time as <task> blocks sharing one set of
+        instructions. The batch size halves when a request exceeds the model's
+        context window, and ads whose output is missing from a batched response
+        fall back to generate_suggestions.
 
-        prompt = f"""
-I need to improve a low-performing Google Responsive Search Ad (RSA). Below is the current ad copy, followed by examples of high-performing ads from the same account.
+        Args:
+            target_ads: The ads to improve
+            exemplars_per_ad: Per target ad, a list of (exemplar_ad, similarity_score) tuples
+            num_variants: Number of variants to generate per ad
 
-**Current Ad (Needs Improvement):**
-Headlines: {', '.join(current_headlines) if current_headlines else 'None'}
-Descriptions: {', '.join(current_descriptions) if current_descriptions else 'None'}
+        Returns:
+            Mapping of target ad id to its GeneratedRSA suggestions
+        """
+        results: dict[int, list[GeneratedRSA]] = {}
+        tasks = []
+        for target_ad, exemplar_ads in zip(target_ads, exemplars_per_ad):
+            if exemplar_ads:
+                tasks.append((target_ad, exemplar_ads))
+            else:
+                logger.warning(f"No exemplars provided for ad {target_ad.id}")
+                results[target_ad.id] = []
+
+        batch_size = self.BATCH_SIZE
+        start = 0
+        while start < len(tasks):
+            batch = tasks[start : start + batch_size]
+
+            if len(batch) == 1:
+                target_ad, exemplar_ads = batch[0]
+                results[target_ad.id] = self.generate_suggestions(
+                    target_ad, exemplar_ads, num_variants
+                )
+                start += 1
+                continue
 
-**High-Performing Ads (Learn from these):**
-{exemplars_section}
+            try:
+                outputs = self._complete_batch(batch, num_variants)
+            except BadRequestError as e:
+                if e.code == "context_length_exceeded":
+                    batch_size = max(1, len(batch) // 2)
+                    logger.warning(
+                        f"Batch of {len(batch)} ads too long, retrying with {batch_size}"
+                    )
+                    continue
+                logger.error(f"Failed to generate batch suggestions: {e}")
+                outputs = None
+            except Exception as e:
+                logger.error(f"Failed to generate batch suggestions: {e}")
+                outputs = None
+
+            for target_ad, exemplar_ads in batch:
+                if outputs is None:
+                    results[target_ad.id] = []
+                elif target_ad.id in outputs:
+                    suggestions = self._parse_response(
+                        outputs[target_ad.id], exemplar_ads, num_variants
+                    )
+                    for suggestion in suggestions:
+                        self._validate_rsa(suggestion)
+                    results[target_ad.id] = suggestions
+                else:
+                    logger.warning(f"Batch response missing ad {target_ad.id}, generating alone")
+                    results[target_ad.id] = self.generate_suggestions(
+                        target_ad, exemplar_ads, num_variants
+                    )
+
+            start += len(batch)
 
-**Task:**
-Generate {num_variants} improved RSA variants that:
-1. Learn from the patterns and messaging in high-performing examples
-2. Maintain similar tone, value propositions, and keyword usage
-3. Improve upon the current ad's weaknesses
-4. Follow RSA best practices (clear CTA, benefits-focused, specific)
+        logger.info(
+            f"Generated {sum(len(v) for v in results.values())} suggestions "
+            f"for {len(results)} ads in batches"
+        )
+        return results
 
-**Strict Constraints:**
-- Each headline: maximum {self.constraints.max_headline_length} characters
-- Each description: maximum {self.constraints.max_description_length} characters
-- Provide {self.constraints.min_headlines}-{self.constraints.max_headlines} headlines per variant
-- Provide {self.constraints.min_descriptions}-{self.constraints.max_descriptions} descriptions per variant
-- All headlines must be unique (no duplicates)
-- All descriptions must be unique (no duplicates)
+    def _complete_batch(
+        self,
+        batch: list[tuple[Ad, list[tuple[Ad, float]]]],
+        num_variants: int,
+    ) -> dict[int, str]:
+        """Run one batched completion and split it into per-ad output text."""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_batch_prompt(batch, num_variants)},
+            ],
+            temperature=0.8,
+            max_tokens=min(1500 * len(batch), self.MAX_BATCH_OUTPUT_TOKENS),
+            n=1,
+        )
+        return _split_batch_outputs(response.choices[0].message.content or "")
 
-**Output Format:**
-For each variant, output exactly like this:
+    def _build_prompt(
+        self,
+        target_ad: Ad,
+        exemplar_ads: list[tuple[Ad, float]],
+        num_variants: int,
+    ) -> str:
+        """
+        Build prompt with exemplars and constraints.
 
-VARIANT 1
-HEADLINES:
-- [Headline 1]
-- [Headline 2]
-- [Headline 3]
-...
-DESCRIPTIONS:
-- [Description 1]
-- [Description 2]
-...
+        Static instructions come first, then exemplars, then the target ad, so
+        prompts for ads sharing an exemplar set share a long common prefix
+        (which the LLM provider's prompt cache can reuse).
+        """
+        exemplars = tuple(
+            (*_ad_copy(ad), round(score, 2)) for ad, score in exemplar_ads[:5]
+        )
 
-VARIANT 2
-...
+        # Assemble the prompt from parts and join once, rather than growing one string
+        parts = [
+            _PROMPT_INTRO,
+            self._constraints_block(),
+            "",
+            _OUTPUT_FORMAT_BLOCK,
+            "**High-Performing Ads (Learn from these):**",
+            _render_exemplars(exemplars),
+            "",
+        ]
+        parts.extend(self._task_parts(target_ad, num_variants))
+        parts.append("")
+        return "\n".join(parts)
+
+    def _build_batch_prompt(
+        self,
+        tasks: list[tuple[Ad, list[tuple[Ad, float]]]],
+        num_variants: int,
+    ) -> str:
+        """
+        Build one prompt covering several (target_ad, exemplar_ads) tasks.
 
-Be specific, compelling, and ensure all constraints are met.
-"""
-        return prompt
+        Exemplars shared between tasks are rendered once in a pool and each
+        task references its exemplars by label.
+        """
+        pool_text, labels = self._render_exemplar_pool(tasks)
+
+        parts = [
+            _BATCH_PROMPT_INTRO,
+            self._constraints_block(),
+            "",
+            _OUTPUT_FORMAT_BLOCK,
+            _BATCH_OUTPUT_INSTRUCTIONS,
+            "**High-Performing Ads (Learn from these):**",
+            pool_text,
+            "",
+        ]
+        for target_ad, exemplar_ads in tasks:
+            refs = ", ".join(
+                f"{labels[ad.id]} (similarity: {score:.2f})" for ad, score in exemplar_ads[:5]
+            )
+            parts.extend((f'<task id="{target_ad.id}">', f"Examples for this ad: {refs}", ""))
+            parts.extend(self._task_parts(target_ad, num_variants))
+            parts.extend(("</task>", ""))
+        return "\n".join(parts)
+
+    def _render_exemplar_pool(
+        self, tasks: list[tuple[Ad, list[tuple[Ad, float]]]]
+    ) -> tuple[str, dict[int, str]]:
+        """
+        Render each distinct exemplar ad across tasks once, in first-seen order.
+
+        Returns (pool_text, label by exemplar ad id), with labels E1, E2, ...
+        """
+        unique_ads: dict[int, Ad] = {}
+        for _, exemplar_ads in tasks:
+            for ad, _ in exemplar_ads[:5]:
+                unique_ads.setdefault(ad.id, ad)
+
+        labels = {}
+        entries = []
+        for n, ad in enumerate(unique_ads.values(), 1):
+            labels[ad.id] = f"E{n}"
+            headlines, descriptions = _ad_copy(ad)
+            entries.append(
+                f"[E{n}] Headlines: {', '.join(headlines[:5])}\n"
+                f"Descriptions: {', '.join(descriptions[:2])}"
+            )
+        return "\n\n".join(entries), labels
+
+    def _constraints_block(self) -> str:
+        """Constraints section; only non-default constraints need rendering per call."""
+        if self.constraints == _DEFAULT_CONSTRAINTS:
+            return _CONSTRAINTS_BLOCK
+        return _render_constraints_block(self.constraints)
+
+    def _task_parts(self, target_ad: Ad, num_variants: int) -> tuple[str, ...]:
+        """Per-ad prompt lines: the task instruction, then the current ad."""
+        current_headlines, current_descriptions = _ad_copy(target_ad)
+
+        return (
+            "**Task:**",
+            _variant_instruction(num_variants),
+            _TASK_GOALS,
+            "**Current Ad (Needs Improvement):**",
+            f"Headlines: {', '.join(current_headlines) if current_headlines else 'None'}",
+            f"Descriptions: {', '.join(current_descriptions) if current_descriptions else 'None'}",
+        )
 
     def _parse_response(
         self,
@@ -249,11 +544,16 @@ Be specific, compelling, and ensure all constraints are met.
 
             # Parse content lines
             if current_variant and line.startswith("-"):
-                text = line[1:].strip()
+                # Tabs or stray carriage returns become single spaces, not validation errors
+                text = " ".join(line[1:].translate(_FORBIDDEN_CHARS).split())
                 if current_section == "headlines":
-                    current_variant.headlines.append(text)
+                    current_variant.headlines.append(
+                        _intern_text(text, self.constraints.max_headline_length)
+                    )
                 elif current_section == "descriptions":
-                    current_variant.descriptions.append(text)
+                    current_variant.descriptions.append(
+                        _intern_text(text, self.constraints.max_description_length)
+                    )
 
         # Add last variant
         if current_variant:
@@ -265,59 +565,62 @@ Be specific, compelling, and ensure all constraints are met.
         return suggestions
 
     def _validate_rsa(self, rsa: GeneratedRSA) -> None:
-        """Validate RSA against constraints and update valid flag."""
-        errors = []
+        """Validate RSA against constraints and update valid flag.
+
+        Violations are recorded as flags plus template arguments; messages are only
+        rendered when ``rsa.validation_errors`` is read.
+        """
+        details: list[tuple[ValidationFlag, tuple]] = []
+        # Bind constraint values to locals once; the checks below only read them
+        c = self.constraints
+        min_headlines, max_headlines = c.min_headlines, c.max_headlines
+        min_descriptions, max_descriptions = c.min_descriptions, c.max_descriptions
+        num_headlines = len(rsa.headlines)
+        num_descriptions = len(rsa.descriptions)
 
         # Check headline count
-        if len(rsa.headlines) < self.constraints.min_headlines:
-            errors.append(
-                f"Too few headlines: {len(rsa.headlines)} < {self.constraints.min_headlines}"
-            )
-        if len(rsa.headlines) > self.constraints.max_headlines:
-            errors.append(
-                f"Too many headlines: {len(rsa.headlines)} > {self.constraints.max_headlines}"
-            )
+        if num_headlines < min_headlines:
+            details.append((ValidationFlag.TOO_FEW_HEADLINES, (num_headlines, min_headlines)))
+        if num_headlines > max_headlines:
+            details.append((ValidationFlag.TOO_MANY_HEADLINES, (num_headlines, max_headlines)))
 
         # Check description count
-        if len(rsa.descriptions) < self.constraints.min_descriptions:
-            errors.append(
-                f"Too few descriptions: {len(rsa.descriptions)} < {self.constraints.min_descriptions}"
+        if num_descriptions < min_descriptions:
+            details.append(
+                (ValidationFlag.TOO_FEW_DESCRIPTIONS, (num_descriptions, min_descriptions))
             )
-        if len(rsa.descriptions) > self.constraints.max_descriptions:
-            errors.append(
-                f"Too many descriptions: {len(rsa.descriptions)} > {self.constraints.max_descriptions}"
+        if num_descriptions > max_descriptions:
+            details.append(
+                (ValidationFlag.TOO_MANY_DESCRIPTIONS, (num_descriptions, max_descriptions))
             )
 
-        # Check headline lengths
-        for i, headline in enumerate(rsa.headlines):
-            if len(headline) > self.constraints.max_headline_length:
-                errors.append(
-                    f"Headline {i+1} too long: {len(headline)} > {self.constraints.max_headline_length}"
-                )
-                # Truncate
-                rsa.headlines[i] = headline[: self.constraints.max_headline_length]
+        # Check headline lengths: one scan finds violators, only those are truncated
+        max_len = c.max_headline_length
+        too_long = [(i, h) for i, h in enumerate(rsa.headlines) if len(h) > max_len]
+        for i, headline in too_long:
+            details.append((ValidationFlag.HEADLINE_TOO_LONG, (i + 1, len(headline), max_len)))
+            rsa.headlines[i] = headline[:max_len]
 
         # Check description lengths
-        for i, desc in enumerate(rsa.descriptions):
-            if len(desc) > self.constraints.max_description_length:
-                errors.append(
-                    f"Description {i+1} too long: {len(desc)} > {self.constraints.max_description_length}"
-                )
-                # Truncate
-                rsa.descriptions[i] = desc[: self.constraints.max_description_length]
+        max_len = c.max_description_length
+        too_long = [(i, d) for i, d in enumerate(rsa.descriptions) if len(d) > max_len]
+        for i, desc in too_long:
+            details.append((ValidationFlag.DESCRIPTION_TOO_LONG, (i + 1, len(desc), max_len)))
+            rsa.descriptions[i] = desc[:max_len]
 
         # Check uniqueness
-        if self.constraints.require_unique:
-            if len(rsa.headlines) != len(set(rsa.headlines)):
-                errors.append("Headlines contain duplicates")
-            if len(rsa.descriptions) != len(set(rsa.descriptions)):
-                errors.append("Descriptions contain duplicates")
-
-        rsa.validation_errors = errors
-        rsa.valid = len(errors) == 0
-
-        if errors:
-            logger.warning(f"RSA validation errors: {errors}")
+        if c.require_unique:
+            duplicate = _first_duplicate(rsa.headlines)
+            if duplicate is not None:
+                details.append((ValidationFlag.DUPLICATE_HEADLINES, (duplicate,)))
+            duplicate = _first_duplicate(rsa.descriptions)
+            if duplicate is not None:
+                details.append((ValidationFlag.DUPLICATE_DESCRIPTIONS, (duplicate,)))
+
+        rsa.set_validation_result(details)
+
+        if details:
+            logger.warning("RSA validation failed: %s", rsa.error_flags.name)
 
 
 def generate_suggestions_for_ad(
@@ -1,6 +1,9 @@
 """Google Ads API client wrapper."""
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional
 
 from google.ads.googleads.client import GoogleAdsClient
@@ -14,37 +17,79 @@ from app.security import decrypt_token
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Clients built from refresh tokens, shared by the OAuth routes and the sync
+# worker (lives for the worker process). Keyed by a SHA-256 of the token so raw
+# secrets are not kept as cache keys.
+_TOKEN_CLIENT_CACHE_SIZE = 128
+_token_clients: "OrderedDict[tuple, GoogleAdsClient]" = OrderedDict()
+_token_clients_lock = threading.Lock()
+
+
+def get_client_for_refresh_token(
+    refresh_token: str, login_customer_id: Optional[str] = None
+) -> GoogleAdsClient:
+    """
+    Get a Google Ads client for a raw refresh token, reusing a cached one if present.
+
+    Avoids re-running GoogleAdsClient.load_from_dict (config parsing and proto
+    setup) on repeat OAuth callbacks for the same token.
+    """
+    login_customer_id = login_customer_id or settings.GOOGLE_ADS_LOGIN_CUSTOMER_ID or None
+    key = (
+        hashlib.sha256(refresh_token.encode()).hexdigest(),
+        settings.GOOGLE_ADS_DEVELOPER_TOKEN,
+        settings.GOOGLE_ADS_CLIENT_ID,
+        login_customer_id,
+    )
+
+    with _token_clients_lock:
+        client = _token_clients.get(key)
+        if client is not None:
+            _token_clients.move_to_end(key)
+            return client
+
+    credentials = {
+        "developer_token": settings.GOOGLE_ADS_DEVELOPER_TOKEN,
+        "client_id": settings.GOOGLE_ADS_CLIENT_ID,
+        "client_secret": settings.GOOGLE_ADS_CLIENT_SECRET,
+        "refresh_token": refresh_token,
+        "use_proto_plus": True,
+    }
+    if login_customer_id:
+        credentials["login_customer_id"] = login_customer_id
+
+    client = GoogleAdsClient.load_from_dict(credentials)
+
+    with _token_clients_lock:
+        _token_clients[key] = client
+        _token_clients.move_to_end(key)
+        while len(_token_clients) > _TOKEN_CLIENT_CACHE_SIZE:
+            _token_clients.popitem(last=False)
+
+    return client
+
 
 def create_google_ads_client(account: ConnectedAccount, db: Session) -> GoogleAdsClient:
-    """Create authenticated Google Ads API client for an account."""
+    """Get an authenticated Google Ads API client for an account, reusing a cached one."""
     try:
         # Decrypt the refresh token from storage
         refresh_token = decrypt_token(account.encrypted_refresh_token)
 
-        # Build client configuration
-        credentials = {
-            "developer_token": settings.GOOGLE_ADS_DEVELOPER_TOKEN,
-            "client_id": settings.GOOGLE_ADS_CLIENT_ID,
-            "client_secret": settings.GOOGLE_ADS_CLIENT_SECRET,
-            "refresh_token": refresh_token,
-            "use_proto_plus": True,
-        }
-
-        # Add login_customer_id if using MCC
-        if account.login_customer_id:
-            credentials["login_customer_id"] = account.login_customer_id
-        elif settings.GOOGLE_ADS_LOGIN_CUSTOMER_ID:
-            credentials["login_customer_id"] = settings.GOOGLE_ADS_LOGIN_CUSTOMER_ID
-
-        # Let the library use its default API version (avoids deprecated version issues)
-        client = GoogleAdsClient.load_from_dict(credentials)
-        return client
+        # login_customer_id falls back to the MCC from settings inside the cache lookup
+        return get_client_for_refresh_token(refresh_token, account.login_customer_id)
 
     except Exception as e:
         logger.error(f"Failed to create Google Ads client for {account.customer_id}: {e}")
         raise
 
 
+def evict_google_ads_client(client: GoogleAdsClient) -> None:
+    """Drop a client from the cache, e.g. after it failed to authenticate."""
+    with _token_clients_lock:
+        for key in [k for k, cached in _token_clients.items() if cached is client]:
+            del _token_clients[key]
+
+
 def validate_account_access(
     client: GoogleAdsClient, customer_id: str
 ) -> Optional[dict]:
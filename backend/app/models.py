@@ -8,6 +8,7 @@ from sqlalchemy import (
     JSON,
     BigInteger,
     Boolean,
+    Computed,
     DateTime,
     Enum,
     Float,
@@ -17,6 +18,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    desc,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -225,6 +227,11 @@ class Ad(Base):
         back_populates="ad", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Keyset pagination for the ads listing (ORDER BY bucket_score DESC NULLS LAST, id DESC)
+        Index("ix_ads_bucket_score_id", desc("bucket_score").nullslast(), desc("id")),
+    )
+
 
 class AdMetricsDaily(Base):
     """Daily ad metrics."""
@@ -280,6 +287,18 @@ class AdMetrics90d(Base):
     cost_per_conversion: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     conversion_rate: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
+    # Micros versions computed by Postgres (read-only, used by API serialization)
+    cost_per_conversion_micros: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        Computed("(cost_per_conversion * 1000000)::bigint", persisted=True),
+        nullable=True,
+    )
+    average_cpc_micros: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        Computed("(average_cpc * 1000000)::bigint", persisted=True),
+        nullable=True,
+    )
+
     # Date range
     period_start: Mapped[datetime] = mapped_column(DateTime)
     period_end: Mapped[datetime] = mapped_column(DateTime)
@@ -330,9 +349,9 @@ class Suggestion(Base):
     ad_id: Mapped[int] = mapped_column(ForeignKey("ads.id"), index=True)
     suggestion_run_id: Mapped[int] = mapped_column(ForeignKey("suggestion_runs.id"), index=True)
 
-    # Generated content
-    headlines: Mapped[dict] = mapped_column(JSON)
-    descriptions: Mapped[dict] = mapped_column(JSON)
+    # Generated content (JSON arrays of strings)
+    headlines: Mapped[list] = mapped_column(JSON)
+    descriptions: Mapped[list] = mapped_column(JSON)
 
     # Provenance
     prompt_version: Mapped[str] = mapped_column(String(50))
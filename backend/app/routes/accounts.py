@@ -3,6 +3,7 @@
 import logging
 from typing import Optional
 
+from celery.utils import uuid
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy import func
@@ -10,9 +11,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.database import get_async_db, get_sync_db
-from app.models import Ad, AdBucket, ConnectedAccount, SyncRun, SyncStatus
+from app.models import Ad, AdBucket, ConnectedAccount, SyncRun
 from app.analysis.scoring import classify_ads_by_performance
-from app.worker import sync_account_data
+from app.worker import (
+    ON_DEMAND_TASK_PRIORITY,
+    acquire_sync_lock,
+    build_exemplar_index_for_account,
+    get_sync_lock_holder,
+    release_sync_lock,
+    sync_account_data,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -93,27 +101,26 @@ async def trigger_sync(
         if not account.is_active:
             raise HTTPException(status_code=400, detail="Account is inactive")
 
-        # Check for recent running sync
-        recent_sync = await db.execute(
-            select(SyncRun)
-            .filter(
-                SyncRun.account_id == account_id,
-                SyncRun.status == SyncStatus.RUNNING,
-            )
-            .order_by(SyncRun.created_at.desc())
-            .limit(1)
-        )
-        recent_sync = recent_sync.scalar_one_or_none()
-
-        if recent_sync:
+        # Take the same per-account lock as scheduled syncs, keyed by the new task's id
+        task_id = uuid()
+        if not acquire_sync_lock(account_id, task_id):
             return SyncResponse(
                 success=False,
                 message="Sync already in progress",
-                task_id=recent_sync.celery_task_id,
+                task_id=get_sync_lock_holder(account_id),
             )
 
-        # Queue sync task
-        task = sync_account_data.apply_async(args=[account_id], queue="sync")
+        # Queue sync task ahead of scheduled syncs
+        try:
+            task = sync_account_data.apply_async(
+                args=[account_id],
+                task_id=task_id,
+                queue="sync",
+                priority=ON_DEMAND_TASK_PRIORITY,
+            )
+        except Exception:
+            release_sync_lock(account_id, task_id)
+            raise
 
         logger.info(f"Queued sync task {task.id} for account {account_id}")
 
@@ -153,6 +160,18 @@ async def trigger_scoring(
         sync_db = get_sync_db()
         try:
             result = classify_ads_by_performance(sync_db, account_id)
+
+            # Buckets changed, so the exemplar index must follow; the build embeds
+            # ads via OpenAI, so it runs in the worker rather than on the event loop
+            try:
+                build_exemplar_index_for_account.apply_async(
+                    args=[account_id], queue="generation"
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to queue exemplar index build (non-critical): {e}", exc_info=True
+                )
+
             return {
                 "success": True,
                 "message": "Scoring completed",
@@ -1,15 +1,21 @@
 """Ads listing and detail routes."""
 
+import hashlib
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
+from sqlalchemy import case, cast, func, literal_column, or_, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, selectinload
 
-from app.database import get_async_db, sync_engine
+from app.database import AsyncSessionLocal, get_async_db, sync_engine
 from app.google_ads.client import create_google_ads_client
 from app.google_ads.queries import fetch_rsa_asset_performance
 from app.models import Ad, AdBucket, AdGroup, AdMetrics90d, Campaign, Keyword, ConnectedAccount
@@ -17,6 +23,40 @@ from app.models import Ad, AdBucket, AdGroup, AdMetrics90d, Campaign, Keyword, C
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Rows fetched per round trip while streaming the ad listing
+AD_STREAM_BATCH_SIZE = 50
+
+
+def _text_array(column):
+    """Extract asset texts from a JSON array column in Postgres.
+
+    Object elements yield their "text" field ("" when it is missing) and bare
+    strings are kept as-is, in array order; a non-array value yields NULL.
+    """
+    document = cast(column, JSONB)
+    elements = (
+        func.jsonb_array_elements(document)
+        .table_valued("value", with_ordinality="ordinality")
+        .render_derived()
+    )
+    element = type_coerce(elements.c.value, JSONB)
+    text = case(
+        (func.jsonb_typeof(element) == "object", element["text"].astext),
+        else_=element.op("#>>")(literal_column("'{}'")),
+    )
+    texts = (
+        select(
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(func.coalesce(text, ""), elements.c.ordinality)),
+                literal_column("'[]'::jsonb"),
+                type_=JSONB,
+            )
+        )
+        .select_from(elements)
+        .scalar_subquery()
+    )
+    return case((func.jsonb_typeof(document) == "array", texts))
+
 
 class AdSummary(BaseModel):
     """Ad summary for listing."""
@@ -59,104 +99,191 @@ class AdDetail(BaseModel):
     keyword_quality_scores: Optional[list] = None
 
 
+def _build_summary(ad: Ad, metrics: Optional[AdMetrics90d], headlines, descriptions) -> AdSummary:
+    """Build the listing summary for one (ad, metrics) row."""
+    # Format metrics
+    metrics_dict = None
+    if metrics:
+        metrics_dict = {
+            "impressions": metrics.impressions,
+            "clicks": metrics.clicks,
+            "ctr": metrics.ctr,
+            "conversions": metrics.conversions,
+            "cvr": metrics.conversion_rate,
+            "cost_micros": metrics.cost_micros,
+            "cost_per_conversion_micros": metrics.cost_per_conversion_micros,
+        }
+
+    # Values come from typed DB columns; skip per-field validation
+    return AdSummary.model_construct(
+        id=ad.id,
+        ad_id=ad.ad_id,
+        ad_type=ad.ad_type,
+        status=ad.status,
+        bucket=ad.bucket,
+        bucket_score=ad.bucket_score,
+        campaign_name=ad.ad_group.campaign.name,
+        ad_group_name=ad.ad_group.name,
+        headlines=headlines or [],
+        descriptions=descriptions or [],
+        metrics_90d=metrics_dict,
+    )
+
+
+def _keyset_page(query, after_score: Optional[float], after_id: Optional[int]):
+    """
+    Order ads by (bucket_score DESC NULLS LAST, id DESC) and start after the cursor.
+
+    Scored ads come first, then the NULL-score tail; a cursor with only an id is
+    already in that tail.
+    """
+    if after_id is not None:
+        if after_score is not None:
+            query = query.filter(
+                or_(
+                    tuple_(Ad.bucket_score, Ad.id) < (after_score, after_id),
+                    Ad.bucket_score.is_(None),
+                )
+            )
+        else:
+            query = query.filter(Ad.bucket_score.is_(None), Ad.id < after_id)
+
+    # id as tie-breaker for a stable cursor
+    return query.order_by(Ad.bucket_score.desc().nullslast(), Ad.id.desc())
+
+
 @router.get("/", response_model=list[AdSummary])
 async def list_ads(
     account_id: int = Query(..., description="Account ID to filter ads"),
     bucket: Optional[str] = Query(None, description="Filter by bucket: best, worst, unknown, all"),
     limit: int = Query(50, le=200, description="Max results to return"),
-    offset: int = Query(0, description="Offset for pagination"),
-    db: AsyncSession = Depends(get_async_db),
+    offset: int = Query(0, description="Offset for pagination (ignored when a cursor is given)"),
+    after_score: Optional[float] = Query(None, description="Keyset cursor: bucket_score of last row"),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: id of last row"),
 ):
-    """List ads for an account with optional bucket filter."""
+    """
+    List ads for an account with optional bucket filter.
+
+    Supports keyset pagination on (bucket_score, id): pass the bucket_score and
+    id of the last ad in a page as after_score / after_id to fetch the next page.
+    An after_id without after_score means the cursor is already in the NULL-score
+    tail of the ordering; after_score without after_id is rejected.
+
+    The JSON array is streamed in batches from a server-side cursor. The query
+    and its first batch run before the response starts, so failures there still
+    return a 500; a failure after that aborts the connection mid-body.
+    """
+    if after_score is not None and after_id is None:
+        raise HTTPException(status_code=422, detail="after_score requires after_id")
+
+    # The request-scoped session is closed before the body is sent,
+    # so the stream owns its own session.
+    session = AsyncSessionLocal()
     try:
-        # Build query - join through AdGroup -> Campaign to filter by account_id
-        from app.models import AdGroup, Campaign
-        
+        def apply_filters(query):
+            # Join through AdGroup -> Campaign to filter by account_id
+            query = (
+                query.join(AdGroup, Ad.ad_group_id == AdGroup.id)
+                .join(Campaign, AdGroup.campaign_id == Campaign.id)
+                .filter(Campaign.account_id == account_id)
+            )
+
+            # Apply bucket filter
+            if bucket and bucket != "all":
+                if bucket == "best":
+                    query = query.filter(Ad.bucket == AdBucket.BEST)
+                elif bucket == "worst":
+                    query = query.filter(Ad.bucket == AdBucket.WORST)
+                elif bucket == "unknown":
+                    query = query.filter(Ad.bucket == AdBucket.UNKNOWN)
+
+            return _keyset_page(query, after_score, after_id)
+
+        page_offset = offset if after_id is None else 0
+
+        query = apply_filters(
+            select(
+                Ad,
+                AdMetrics90d,
+                _text_array(Ad.headlines).label("headline_texts"),
+                _text_array(Ad.descriptions).label("description_texts"),
+            ).outerjoin(AdMetrics90d, Ad.id == AdMetrics90d.ad_id)
+        ).options(
+            selectinload(Ad.ad_group).selectinload(AdGroup.campaign),
+            # Only the extracted text arrays are needed for the listing
+            defer(Ad.headlines),
+            defer(Ad.descriptions),
+            # The summary never reads the metrics window; skip building datetimes per row
+            defer(AdMetrics90d.period_start),
+            defer(AdMetrics90d.period_end),
+        )
         query = (
-            select(Ad, AdMetrics90d)
-            .outerjoin(AdMetrics90d, Ad.id == AdMetrics90d.ad_id)
-            .join(AdGroup, Ad.ad_group_id == AdGroup.id)
-            .join(Campaign, AdGroup.campaign_id == Campaign.id)
-            .filter(Campaign.account_id == account_id)
-            .options(selectinload(Ad.ad_group).selectinload(AdGroup.campaign))
+            query.offset(page_offset)
+            .limit(limit)
+            .execution_options(yield_per=AD_STREAM_BATCH_SIZE)
         )
 
-        # Apply bucket filter
-        if bucket and bucket != "all":
-            if bucket == "best":
-                query = query.filter(Ad.bucket == AdBucket.BEST)
-            elif bucket == "worst":
-                query = query.filter(Ad.bucket == AdBucket.WORST)
-            elif bucket == "unknown":
-                query = query.filter(Ad.bucket == AdBucket.UNKNOWN)
-
-        # Order by score (nulls last)
-        query = query.order_by(Ad.bucket_score.desc().nullslast())
-
-        # Pagination
-        query = query.limit(limit).offset(offset)
-
-        result = await db.execute(query)
-        rows = result.all()
-
-        summaries = []
-        for ad, metrics in rows:
-            # Extract headlines and descriptions
-            headlines = []
-            if ad.headlines:
-                headlines = [h.get("text", "") for h in ad.headlines if isinstance(h, dict)]
-            
-            descriptions = []
-            if ad.descriptions:
-                descriptions = [d.get("text", "") for d in ad.descriptions if isinstance(d, dict)]
-
-            # Format metrics
-            metrics_dict = None
-            if metrics:
-                metrics_dict = {
-                    "impressions": metrics.impressions,
-                    "clicks": metrics.clicks,
-                    "ctr": metrics.ctr,
-                    "conversions": metrics.conversions,
-                    "cvr": metrics.conversion_rate,
-                    "cost_micros": metrics.cost_micros,
-                    "cost_per_conversion_micros": int(metrics.cost_per_conversion * 1_000_000) if metrics.cost_per_conversion else None,
-                }
-
-            summaries.append(
-                AdSummary(
-                    id=ad.id,
-                    ad_id=ad.ad_id,
-                    ad_type=ad.ad_type,
-                    status=ad.status,
-                    bucket=ad.bucket,
-                    bucket_score=ad.bucket_score,
-                    campaign_name=ad.ad_group.campaign.name,
-                    ad_group_name=ad.ad_group.name,
-                    headlines=headlines,
-                    descriptions=descriptions,
-                    metrics_90d=metrics_dict,
-                )
-            )
-
-        return summaries
+        result = await session.stream(query)
+        batches = result.partitions()
+        first_batch = await anext(batches, [])
 
     except Exception as e:
+        await session.close()
         logger.error(f"Failed to list ads: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def stream_summaries():
+        try:
+            yield b"["
+            first = True
+            batch = first_batch
+            while batch:
+                for ad, metrics, headline_texts, description_texts in batch:
+                    if not first:
+                        yield b","
+                    summary = _build_summary(ad, metrics, headline_texts, description_texts)
+                    yield orjson.dumps(summary.model_dump())
+                    first = False
+                batch = await anext(batches, [])
+            yield b"]"
+        except Exception as e:
+            logger.error(f"Failed to stream ads for account {account_id}: {e}", exc_info=True)
+            raise
+        finally:
+            await session.close()
+
+    # The generator's finally never runs if the body is never iterated, so the
+    # response also closes the session once it is done (closing twice is a no-op)
+    return StreamingResponse(
+        stream_summaries(),
+        media_type="application/json",
+        background=BackgroundTask(session.close),
+    )
+
 
 @router.get("/{ad_id}", response_model=AdDetail)
 async def get_ad_detail(
     ad_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_async_db),
 ):
-    """Get detailed information for a specific ad."""
+    """
+    Get detailed information for a specific ad.
+
+    Responds with an ETag hashed from the serialized response. The RSA asset
+    performance is fetched live from Google Ads, so the payload is always built;
+    a matching If-None-Match only saves sending it (304).
+    """
     try:
         # Get ad with metrics and relationships
         # Use explicit column selection to avoid issues with missing columns
         result = await db.execute(
-            select(Ad, AdMetrics90d)
+            select(
+                Ad,
+                AdMetrics90d,
+                _text_array(Ad.headlines).label("headline_texts"),
+                _text_array(Ad.descriptions).label("description_texts"),
+            )
             .outerjoin(AdMetrics90d, Ad.id == AdMetrics90d.ad_id)
             .filter(Ad.id == ad_id)
             .options(
@@ -170,8 +297,8 @@ async def get_ad_detail(
         if not row:
             raise HTTPException(status_code=404, detail="Ad not found")
 
-        ad, metrics = row
-        
+        ad, metrics, headline_texts, description_texts = row
+
         # Handle missing google_ads_created_at column gracefully
         google_ads_created_at = None
         try:
@@ -180,22 +307,9 @@ async def get_ad_detail(
             # Column doesn't exist in database yet
             pass
 
-        # Extract headlines and descriptions (handle both dict and string formats)
-        headlines = []
-        if ad.headlines:
-            if isinstance(ad.headlines, list):
-                headlines = [
-                    h.get("text", "") if isinstance(h, dict) else str(h)
-                    for h in ad.headlines
-                ]
-        
-        descriptions = []
-        if ad.descriptions:
-            if isinstance(ad.descriptions, list):
-                descriptions = [
-                    d.get("text", "") if isinstance(d, dict) else str(d)
-                    for d in ad.descriptions
-                ]
+        # Headline/description texts are extracted by Postgres
+        headlines = headline_texts or []
+        descriptions = description_texts or []
 
         # Format metrics to match frontend expectations
         metrics_dict = None
@@ -207,32 +321,41 @@ async def get_ad_detail(
                 "conversions": metrics.conversions,
                 "cvr": metrics.conversion_rate,
                 "cost_micros": metrics.cost_micros,
-                "cost_per_conversion_micros": int(metrics.cost_per_conversion * 1_000_000) if metrics.cost_per_conversion else None,
-                "average_cpc_micros": int(metrics.average_cpc * 1_000_000) if metrics.average_cpc else 0,
+                "cost_per_conversion_micros": metrics.cost_per_conversion_micros,
+                "average_cpc_micros": metrics.average_cpc_micros or 0,
             }
 
         # Fetch keyword quality scores for this ad group
         keyword_quality_scores = []
         try:
+            # Project only the quality score fields out of raw_response in Postgres
             keywords_result = await db.execute(
-                select(Keyword).filter(Keyword.ad_group_id == ad.ad_group_id)
+                select(
+                    Keyword.criterion_id,
+                    Keyword.text,
+                    Keyword.match_type,
+                    Keyword.status,
+                    Keyword.raw_response["quality_score"].label("quality_score"),
+                    Keyword.raw_response["creative_quality_score"].label("creative_quality_score"),
+                    Keyword.raw_response["post_click_quality_score"].label(
+                        "post_click_quality_score"
+                    ),
+                    Keyword.raw_response["search_predicted_ctr"].label("search_predicted_ctr"),
+                ).filter(Keyword.ad_group_id == ad.ad_group_id)
             )
-            keywords = keywords_result.scalars().all()
-            for kw in keywords:
-                quality_data = {}
-                # Handle missing raw_response column gracefully
-                if hasattr(kw, "raw_response") and kw.raw_response:
-                    quality_data = kw.raw_response
-                keyword_quality_scores.append({
-                    "criterion_id": kw.criterion_id,
-                    "text": kw.text,
-                    "match_type": kw.match_type,
-                    "status": kw.status,
-                    "quality_score": quality_data.get("quality_score"),
-                    "creative_quality_score": quality_data.get("creative_quality_score"),
-                    "post_click_quality_score": quality_data.get("post_click_quality_score"),
-                    "search_predicted_ctr": quality_data.get("search_predicted_ctr"),
-                })
+            keyword_quality_scores = [
+                {
+                    "criterion_id": criterion_id,
+                    "text": text,
+                    "match_type": match_type,
+                    "status": status,
+                    "quality_score": qs,
+                    "creative_quality_score": cqs,
+                    "post_click_quality_score": pcqs,
+                    "search_predicted_ctr": spctr,
+                }
+                for criterion_id, text, match_type, status, qs, cqs, pcqs, spctr in keywords_result
+            ]
         except Exception as e:
             logger.warning(f"Failed to fetch keyword quality scores (columns may not exist yet): {e}")
             # Continue without quality scores
@@ -313,7 +436,7 @@ async def get_ad_detail(
             f"headline_performance={headline_performance is not None}"
         )
 
-        return AdDetail(
+        detail = AdDetail.model_construct(
             id=ad.id,
             ad_id=ad.ad_id,
             ad_type=ad.ad_type,
@@ -336,6 +459,18 @@ async def get_ad_detail(
             headline_performance=headline_performance,
         )
 
+        # Hash the full payload: part of it comes live from the Google Ads API,
+        # so no stored timestamp versions it.
+        body = orjson.dumps(detail.model_dump())
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        ):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
     except HTTPException:
         raise
     except Exception as e:
@@ -4,9 +4,8 @@ from datetime import datetime
 
 from fastapi import APIRouter
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_async_db
+from app.database import AsyncSessionLocal
 
 router = APIRouter()
 
@@ -24,14 +23,14 @@ async def health_check():
 async def health_check_db():
     """Health check with database connection test."""
     try:
-        async for db in get_async_db():
-            result = await db.execute(text("SELECT 1"))
-            result.scalar()
-            return {
-                "status": "healthy",
-                "database": "connected",
-                "timestamp": datetime.utcnow().isoformat(),
-            }
+        # Context-managed session returns the connection to the pool immediately
+        async with AsyncSessionLocal() as db:
+            await db.scalar(text("SELECT 1"))
+        return {
+            "status": "healthy",
+            "database": "connected",
+            "timestamp": datetime.utcnow().isoformat(),
+        }
     except Exception as e:
         return {
             "status": "unhealthy",
@@ -12,7 +12,11 @@ from sqlalchemy.future import select
 
 from app.config import get_settings
 from app.database import get_async_db
-from app.google_ads.client import list_accessible_customers, validate_account_access
+from app.google_ads.client import (
+    get_client_for_refresh_token,
+    list_accessible_customers,
+    validate_account_access,
+)
 from app.models import ConnectedAccount, User
 from app.oauth import (
     create_oauth_flow,
@@ -94,25 +98,11 @@ async def google_ads_oauth_callback(
                 detail="Developer token not configured. Please set GOOGLE_ADS_DEVELOPER_TOKEN.",
             )
 
-        # Create temporary client to list accessible customers
-        from google.ads.googleads.client import GoogleAdsClient
-
-        temp_credentials = {
-            "developer_token": settings.GOOGLE_ADS_DEVELOPER_TOKEN,
-            "client_id": settings.GOOGLE_ADS_CLIENT_ID,
-            "client_secret": settings.GOOGLE_ADS_CLIENT_SECRET,
-            "refresh_token": credentials.refresh_token,
-            "use_proto_plus": True,
-        }
-
-        if settings.GOOGLE_ADS_LOGIN_CUSTOMER_ID:
-            temp_credentials["login_customer_id"] = settings.GOOGLE_ADS_LOGIN_CUSTOMER_ID
-
         customer_ids = []
         account_info_map = {}
         try:
-            # Use default API version (library will pick latest supported)
-            temp_client = GoogleAdsClient.load_from_dict(temp_credentials)
+            # Temporary client to list accessible customers (cached per refresh token)
+            temp_client = get_client_for_refresh_token(credentials.refresh_token)
 
             # List accessible customers
             customer_ids = list_accessible_customers(temp_client)
@@ -276,23 +266,8 @@ async def connect_google_ads_account(
                 descriptive_name=existing.descriptive_name,
             )
 
-        # Create client and validate access
-        from google.ads.googleads.client import GoogleAdsClient
-
-        credentials = {
-            "developer_token": settings.GOOGLE_ADS_DEVELOPER_TOKEN,
-            "client_id": settings.GOOGLE_ADS_CLIENT_ID,
-            "client_secret": settings.GOOGLE_ADS_CLIENT_SECRET,
-            "refresh_token": request.refresh_token,
-            "use_proto_plus": True,
-        }
-
-        if request.login_customer_id:
-            credentials["login_customer_id"] = request.login_customer_id
-        elif settings.GOOGLE_ADS_LOGIN_CUSTOMER_ID:
-            credentials["login_customer_id"] = settings.GOOGLE_ADS_LOGIN_CUSTOMER_ID
-
-        client = GoogleAdsClient.load_from_dict(credentials)
+        # Create client (cached per refresh token) and validate access
+        client = get_client_for_refresh_token(request.refresh_token, request.login_customer_id)
 
         # Validate account access
         account_info = validate_account_access(client, request.customer_id)
@@ -1,24 +1,31 @@
 """Ad copy suggestion generation routes."""
 
+import asyncio
 import logging
 from typing import Optional
 
+import numpy as np
 from fastapi import APIRouter, Body, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.analysis.scoring import get_best_ads
 from app.config import get_settings
-from app.database import get_async_db, get_sync_db
-from app.generation.embeddings import embed_best_ads, retrieve_exemplars_for_ad
-from app.generation.generator import generate_suggestions_for_ad
+from app.database import get_async_db
+from app.generation.embeddings import embed_ad
+from app.generation.exemplar_index import load_exemplar_index
+from app.generation.generator import RSAConstraints, generate_suggestions_for_ad
 from app.models import Ad, Suggestion, SuggestionRun
+from app.worker import build_exemplar_index_for_account
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 settings = get_settings()
 
+# Rows fetched per round trip when listing suggestions
+SUGGESTION_STREAM_BATCH_SIZE = 500
+
 
 class GenerateSuggestionsRequest(BaseModel):
     """Request to generate suggestions for an ad."""
@@ -69,7 +76,8 @@ async def generate_suggestions(
     """
     Generate ad copy suggestions for a specific ad.
 
-    Uses embeddings to find similar high-performing ads as exemplars.
+    Uses embeddings to find similar high-performing ads as exemplars,
+    searched in the account's precomputed exemplar index.
     """
     try:
         # Get target ad with relationships
@@ -94,94 +102,103 @@ async def generate_suggestions(
         if request is None:
             request = GenerateSuggestionsRequest()
 
-        # Get best-performing ads for this account (use sync session for heavy ops)
-        sync_db = get_sync_db()
-        try:
-            best_ads = get_best_ads(sync_db, account_id, limit=20)
-
-            if not best_ads:
-                return GenerateSuggestionsResponse(
-                    ad_id=ad_id,
-                    variants=[],
-                    message="No high-performing ads found to use as exemplars. Run scoring first.",
-                )
-
-            # Generate embeddings for best ads
-            best_ads_list, best_embeddings = embed_best_ads(best_ads)
-
-            if not best_ads_list:
-                return GenerateSuggestionsResponse(
-                    ad_id=ad_id,
-                    variants=[],
-                    message="Failed to generate embeddings for exemplar ads.",
-                )
-
-            # Retrieve exemplars for target ad
-            exemplars = retrieve_exemplars_for_ad(
-                target_ad, best_ads_list, best_embeddings, top_k=request.top_k_exemplars
-            )
-
-            if not exemplars:
-                return GenerateSuggestionsResponse(
-                    ad_id=ad_id,
-                    variants=[],
-                    message="Failed to retrieve exemplar ads.",
-                )
-
-            # Generate suggestions
-            generated_rsas = generate_suggestions_for_ad(
-                target_ad, exemplars, num_variants=request.num_variants
-            )
-
-            # Convert to response format
-            variants = [
-                SuggestionVariant(
-                    headlines=rsa.headlines,
-                    descriptions=rsa.descriptions,
-                    valid=rsa.valid,
-                    validation_errors=rsa.validation_errors,
-                    exemplar_ids=rsa.exemplar_ids,
-                    similarity_scores=rsa.similarity_scores,
-                )
-                for rsa in generated_rsas
-            ]
-
-            # Store suggestions in database (async)
-            # Create suggestion run
-            suggestion_run = SuggestionRun(
-                account_id=account_id,
-                status="completed",
-                ads_processed=1,
-                suggestions_generated=len(variants),
+        # Look up the account's exemplar index (built by the sync worker)
+        index = await asyncio.to_thread(load_exemplar_index, account_id)
+        if index is None:
+            # Not built yet (e.g. account synced before the index existed);
+            # build it in the worker rather than inside this request
+            build_exemplar_index_for_account.apply_async(args=[account_id], queue="generation")
+            return GenerateSuggestionsResponse(
+                ad_id=ad_id,
+                variants=[],
+                message="No exemplar index for this account yet. It is being built from "
+                "the best-performing ads; try again shortly (run scoring first if none exist).",
             )
-            db.add(suggestion_run)
-            await db.flush()
-
-            # Store each variant
-            for rsa in generated_rsas:
-                suggestion = Suggestion(
-                    ad_id=target_ad.id,
-                    suggestion_run_id=suggestion_run.id,
-                    headlines={"items": rsa.headlines},
-                    descriptions={"items": rsa.descriptions},
-                    prompt_version=rsa.prompt_version,
-                    exemplar_ad_ids=rsa.exemplar_ids,
-                    similarity_scores=rsa.similarity_scores,
-                    model_used=rsa.model_used,
-                    applied=False,
-                )
-                db.add(suggestion)
-
-            await db.commit()
 
+        # Retrieve exemplars for target ad. Blocking client calls (Redis, OpenAI)
+        # run in worker threads so the event loop keeps serving other requests.
+        target_embedding = await asyncio.to_thread(embed_ad, target_ad)
+        hits = (
+            index.search(target_embedding, top_k=request.top_k_exemplars)
+            if target_embedding is not None
+            else []
+        )
+        exemplar_result = await db.execute(
+            select(Ad).filter(Ad.id.in_([exemplar_id for exemplar_id, _ in hits]))
+        )
+        exemplar_ads_by_id = {ad.id: ad for ad in exemplar_result.scalars()}
+        exemplars = [
+            (exemplar_ads_by_id[exemplar_id], score)
+            for exemplar_id, score in hits
+            if exemplar_id in exemplar_ads_by_id
+        ]
+
+        if not exemplars:
             return GenerateSuggestionsResponse(
                 ad_id=ad_id,
-                variants=variants,
-                message=f"Generated {len(variants)} suggestion(s) successfully",
+                variants=[],
+                message="Failed to retrieve exemplar ads.",
             )
 
-        finally:
-            sync_db.close()
+        logger.info(
+            f"Retrieved {len(exemplars)} exemplars for ad {target_ad.id}, "
+            f"similarity scores: {[f'{s:.3f}' for _, s in exemplars]}"
+        )
+
+        # Generate suggestions
+        generated_rsas = await asyncio.to_thread(
+            generate_suggestions_for_ad, target_ad, exemplars, request.num_variants
+        )
+
+        # Convert to response format
+        variants = [
+            SuggestionVariant(
+                headlines=rsa.headlines,
+                descriptions=rsa.descriptions,
+                valid=rsa.valid,
+                validation_errors=rsa.validation_errors,
+                exemplar_ids=rsa.exemplar_ids,
+                similarity_scores=rsa.similarity_scores,
+            )
+            for rsa in generated_rsas
+        ]
+
+        # Store suggestions in database (async)
+        # Create suggestion run
+        suggestion_run = SuggestionRun(
+            account_id=account_id,
+            status="completed",
+            ads_processed=1,
+            suggestions_generated=len(variants),
+        )
+        db.add(suggestion_run)
+        await db.flush()
+
+        # Store all variants in a single multi-row INSERT
+        rows = [
+            {
+                "ad_id": target_ad.id,
+                "suggestion_run_id": suggestion_run.id,
+                "headlines": rsa.headlines,
+                "descriptions": rsa.descriptions,
+                "prompt_version": rsa.prompt_version,
+                "exemplar_ad_ids": rsa.exemplar_ids,
+                "similarity_scores": rsa.similarity_scores,
+                "model_used": rsa.model_used,
+                "applied": False,
+            }
+            for rsa in generated_rsas
+        ]
+        if rows:
+            await db.execute(insert(Suggestion), rows)
+
+        await db.commit()
+
+        return GenerateSuggestionsResponse(
+            ad_id=ad_id,
+            variants=variants,
+            message=f"Generated {len(variants)} suggestion(s) successfully",
+        )
 
     except HTTPException:
         raise
@@ -218,6 +235,53 @@ async def apply_suggestion(
     )
 
 
+def _validate_suggestion_copies(copies: list[tuple[list[str], list[str]]]) -> list[list[str]]:
+    """
+    Check stored suggestions against RSA constraints.
+
+    Counts and text lengths of every suggestion are flattened into NumPy arrays
+    so all comparisons run as a handful of array ops, however many suggestions
+    an ad has. Returns the list of error messages for each suggestion.
+    """
+    c = RSAConstraints()
+    n = len(copies)
+    errors: list[list[str]] = [[] for _ in range(n)]
+    if n == 0:
+        return errors
+
+    h_counts = np.fromiter((len(h) for h, _ in copies), dtype=np.int64, count=n)
+    d_counts = np.fromiter((len(d) for _, d in copies), dtype=np.int64, count=n)
+
+    # Count checks
+    count_checks = (
+        (h_counts, "<", c.min_headlines, "Too few headlines"),
+        (h_counts, ">", c.max_headlines, "Too many headlines"),
+        (d_counts, "<", c.min_descriptions, "Too few descriptions"),
+        (d_counts, ">", c.max_descriptions, "Too many descriptions"),
+    )
+    for counts, op, bound, message in count_checks:
+        mask = counts < bound if op == "<" else counts > bound
+        for i in np.flatnonzero(mask):
+            errors[i].append(f"{message}: {counts[i]} {op} {bound}")
+
+    # Length checks over flattened texts, mapped back to (suggestion, position)
+    length_checks = (
+        (h_counts, (t for h, _ in copies for t in h), c.max_headline_length, "Headline"),
+        (d_counts, (t for _, d in copies for t in d), c.max_description_length, "Description"),
+    )
+    for counts, texts, max_length, label in length_checks:
+        total = int(counts.sum())
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=total)
+        owners = np.repeat(np.arange(n), counts)
+        positions = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        for j in np.flatnonzero(lengths > max_length):
+            errors[owners[j]].append(
+                f"{label} {positions[j] + 1} too long: {lengths[j]} > {max_length}"
+            )
+
+    return errors
+
+
 @router.get("/{ad_id}")
 async def list_suggestions_for_ad(
     ad_id: int,
@@ -225,65 +289,42 @@ async def list_suggestions_for_ad(
 ):
     """List all suggestions generated for a specific ad."""
     try:
-        result = await db.execute(
-            select(Suggestion).filter(Suggestion.ad_id == ad_id).order_by(Suggestion.created_at.desc())
+        # Plain column tuples streamed through a server-side cursor in batches:
+        # no ORM identity map, no full-result buffer
+        stream = await db.stream(
+            select(
+                Suggestion.id,
+                Suggestion.headlines,
+                Suggestion.descriptions,
+                Suggestion.exemplar_ad_ids,
+                Suggestion.created_at,
+            )
+            .filter(Suggestion.ad_id == ad_id)
+            .order_by(Suggestion.created_at.desc())
+            .execution_options(yield_per=SUGGESTION_STREAM_BATCH_SIZE)
         )
-        suggestions = result.scalars().all()
 
         result = []
-        for s in suggestions:
-            # Extract headlines and descriptions from JSON format
-            headlines = []
-            descriptions = []
-            
-            if isinstance(s.headlines, dict) and "items" in s.headlines:
-                headlines = s.headlines["items"]
-            elif isinstance(s.headlines, list):
-                headlines = s.headlines
-                
-            if isinstance(s.descriptions, dict) and "items" in s.descriptions:
-                descriptions = s.descriptions["items"]
-            elif isinstance(s.descriptions, list):
-                descriptions = s.descriptions
-            
-            # Determine validation status
-            validation_passed = True
-            validation_errors = []
-            
-            # Basic validation checks
-            if len(headlines) < 3:
-                validation_passed = False
-                validation_errors.append(f"Too few headlines: {len(headlines)} < 3")
-            if len(headlines) > 15:
-                validation_passed = False
-                validation_errors.append(f"Too many headlines: {len(headlines)} > 15")
-            if len(descriptions) < 2:
-                validation_passed = False
-                validation_errors.append(f"Too few descriptions: {len(descriptions)} < 2")
-            if len(descriptions) > 4:
-                validation_passed = False
-                validation_errors.append(f"Too many descriptions: {len(descriptions)} > 4")
-            
-            # Check lengths
-            for i, h in enumerate(headlines):
-                if len(h) > 30:
-                    validation_passed = False
-                    validation_errors.append(f"Headline {i+1} too long: {len(h)} > 30")
-            for i, d in enumerate(descriptions):
-                if len(d) > 90:
-                    validation_passed = False
-                    validation_errors.append(f"Description {i+1} too long: {len(d)} > 90")
-            
-            result.append({
-                "id": s.id,
-                "headlines": headlines,
-                "descriptions": descriptions,
-                "validation_passed": validation_passed,
-                "validation_errors": validation_errors if validation_errors else None,
-                "exemplar_ad_ids": s.exemplar_ad_ids,
-                "created_at": s.created_at.isoformat(),
-            })
-        
+        async for suggestions in stream.partitions():
+            # Columns always hold JSON arrays (see normalize_suggestion_copy migration)
+            copies = [(s.headlines or [], s.descriptions or []) for s in suggestions]
+
+            # Validate each batch in one vectorized pass
+            all_errors = _validate_suggestion_copies(copies)
+
+            for s, (headlines, descriptions), validation_errors in zip(
+                suggestions, copies, all_errors
+            ):
+                result.append({
+                    "id": s.id,
+                    "headlines": headlines,
+                    "descriptions": descriptions,
+                    "validation_passed": not validation_errors,
+                    "validation_errors": validation_errors if validation_errors else None,
+                    "exemplar_ad_ids": s.exemplar_ad_ids,
+                    "created_at": s.created_at.isoformat(),
+                })
+
         return result
 
     except Exception as e:
@@ -4,16 +4,25 @@ import secrets
 from datetime import datetime, timedelta
 from typing import Optional
 
+import jwt
 from cryptography.fernet import Fernet
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import get_settings
 
 settings = get_settings()
 
-# Password hashing (not used in MVP but included for future user auth)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (not used in MVP but included for future user auth).
+# Argon2id with OWASP parameters (19 MiB, t=2, p=1); bcrypt hashes still verify
+# and are flagged for rehash via deprecated="auto".
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
 
 # Fernet encryption for OAuth tokens
 _cipher_suite: Optional[Fernet] = None
@@ -32,6 +41,13 @@ def get_cipher_suite() -> Fernet:
     return _cipher_suite
 
 
+# Preload the cipher at import; a missing/invalid key is reported on first use instead
+try:
+    get_cipher_suite()
+except ValueError:
+    pass
+
+
 def encrypt_token(token: str) -> str:
     """Encrypt an OAuth token for storage."""
     cipher = get_cipher_suite()
@@ -49,6 +65,10 @@ def generate_oauth_state() -> str:
     return secrets.token_urlsafe(32)
 
 
+# Session tokens carry no audience/issuer claims
+_JWT_DECODE_OPTIONS = {"verify_aud": False, "verify_iss": False}
+
+
 def create_session_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT session token."""
     to_encode = data.copy()
@@ -64,9 +84,11 @@ def create_session_token(data: dict, expires_delta: Optional[timedelta] = None)
 def verify_session_token(token: str) -> Optional[dict]:
     """Verify and decode a JWT session token."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=["HS256"], options=_JWT_DECODE_OPTIONS
+        )
         return payload
-    except JWTError:
+    except jwt.PyJWTError:
         return None
 
 
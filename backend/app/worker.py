@@ -1,19 +1,25 @@
 """Celery worker configuration and task definitions."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional
 
-from celery import Celery
+from celery import Celery, group
 from celery.schedules import crontab
-from sqlalchemy import select
+from celery.utils import uuid
+from google.ads.googleads.errors import GoogleAdsException
+from google.auth.exceptions import RefreshError
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.database import get_sync_db
-from app.google_ads.client import create_google_ads_client
+from app.database import get_redis, get_sync_db
+from app.google_ads.client import create_google_ads_client, evict_google_ads_client
 from app.google_ads.ingestion import ingest_ads_with_90d_metrics, ingest_keywords
 from app.google_ads.queries import fetch_ads_with_metrics_90d, fetch_keywords
 from app.analysis.scoring import classify_ads_by_performance
+from app.generation.exemplar_index import build_exemplar_index
 from app.models import ConnectedAccount, SyncRun, SyncStatus
 
 settings = get_settings()
@@ -39,13 +45,70 @@ celery_app.conf.update(
     task_acks_late=True,
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=50,
+    # Redis broker priorities: 0 is highest. Scheduled work runs at the default,
+    # user-triggered syncs jump ahead with ON_DEMAND_TASK_PRIORITY.
+    task_default_priority=5,
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "sep": ":",
+    },
     task_routes={
         "app.worker.sync_account_data": {"queue": "sync"},
         "app.worker.generate_suggestions_for_account": {"queue": "generation"},
+        "app.worker.build_exemplar_index_for_account": {"queue": "generation"},
         "app.worker.schedule_all_account_syncs": {"queue": "scheduler"},
     },
 )
 
+# Priority for user-triggered tasks (lower runs first on the Redis broker)
+ON_DEMAND_TASK_PRIORITY = 0
+
+# Per-account sync lock, held from scheduling until the sync task's last attempt
+SYNC_LOCK_TTL_SECONDS = 7200
+_RELEASE_LOCK_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+)
+_EXTEND_LOCK_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('expire', KEYS[1], ARGV[2]) end return 0"
+)
+
+
+def _sync_lock_key(account_id: int) -> str:
+    return f"sync:lock:{account_id}"
+
+
+def acquire_sync_lock(account_id: int, task_id: str) -> bool:
+    """Take the account's sync lock for task_id (SET NX EX); False if a sync holds it."""
+    return bool(
+        get_redis().set(_sync_lock_key(account_id), task_id, nx=True, ex=SYNC_LOCK_TTL_SECONDS)
+    )
+
+
+def get_sync_lock_holder(account_id: int) -> Optional[str]:
+    """Return the task id holding the account's sync lock, if any."""
+    holder = get_redis().get(_sync_lock_key(account_id))
+    return holder.decode() if holder is not None else None
+
+
+def release_sync_lock(account_id: int, task_id: str) -> None:
+    """Release the account's sync lock if it is held by this task."""
+    try:
+        get_redis().eval(_RELEASE_LOCK_SCRIPT, 1, _sync_lock_key(account_id), task_id)
+    except Exception as e:
+        logger.warning(f"Failed to release sync lock for account {account_id}: {e}")
+
+
+def _extend_sync_lock(account_id: int, task_id: str) -> None:
+    """Reset the lock's TTL so it outlives the wait before this task's retry."""
+    try:
+        get_redis().eval(
+            _EXTEND_LOCK_SCRIPT, 1, _sync_lock_key(account_id), task_id, SYNC_LOCK_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Failed to extend sync lock for account {account_id}: {e}")
+
+
 # Beat schedule for periodic tasks
 celery_app.conf.beat_schedule = {
     "schedule-nightly-syncs": {
@@ -77,6 +140,8 @@ def sync_account_data(self, account_id: int, days: int = 90) -> dict:
     """
     db = get_sync_db()
     sync_run = None
+    client = None
+    retrying = False
 
     try:
         logger.info(f"Starting sync for account {account_id}, task {self.request.id}")
@@ -109,12 +174,18 @@ def sync_account_data(self, account_id: int, days: int = 90) -> dict:
             f"Syncing account {account.customer_id} from {period_start.date()} to {period_end.date()}"
         )
 
-        # Create Google Ads client
+        # Get Google Ads client (cached for the worker process)
         client = create_google_ads_client(account, db)
 
-        # Fetch ads with 90d metrics
-        logger.info(f"Fetching ads with {days}-day metrics for {account.customer_id}")
-        ads_data = fetch_ads_with_metrics_90d(client, account.customer_id, days)
+        # Fetch ads with 90d metrics and keywords concurrently (independent API calls);
+        # ingestion below stays sequential on the one DB session
+        logger.info(f"Fetching ads with {days}-day metrics and keywords for {account.customer_id}")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            ads_future = executor.submit(
+                fetch_ads_with_metrics_90d, client, account.customer_id, days
+            )
+            keywords_future = executor.submit(fetch_keywords, client, account.customer_id)
+            ads_data = ads_future.result()
         logger.info(f"Fetched {len(ads_data)} ad records")
 
         # Ingest ads data
@@ -122,10 +193,9 @@ def sync_account_data(self, account_id: int, days: int = 90) -> dict:
             db, account_id, ads_data, period_start, period_end
         )
 
-        # Fetch keywords (best-effort)
+        # Ingest keywords (best-effort)
         try:
-            logger.info(f"Fetching keywords for {account.customer_id}")
-            keywords_data = fetch_keywords(client, account.customer_id)
+            keywords_data = keywords_future.result()
             keywords_count = ingest_keywords(db, keywords_data)
             logger.info(f"Ingested {keywords_count} keywords")
         except Exception as e:
@@ -145,28 +215,42 @@ def sync_account_data(self, account_id: int, days: int = 90) -> dict:
             logger.warning(f"Ad scoring failed (non-critical): {e}", exc_info=True)
             # Don't fail the sync if scoring fails
 
-        # Update sync run status
-        sync_run.status = SyncStatus.SUCCESS
-        sync_run.completed_at = datetime.utcnow()
-        sync_run.ads_synced = ads_count
-        db.commit()
-
-        # Update account metadata
-        account.last_sync_at = datetime.utcnow()
-        account.last_sync_status = SyncStatus.SUCCESS
-        account.last_sync_error = None
+        # Rebuild exemplar index from the fresh BEST bucket so /generate
+        # doesn't embed best ads inside the web request
+        try:
+            build_exemplar_index(db, account_id)
+        except Exception as e:
+            logger.warning(f"Exemplar index build failed (non-critical): {e}", exc_info=True)
+
+        # Update sync run status and account metadata in one transaction
+        completed_at = datetime.utcnow()
+        sync_run_id = sync_run.id
+        started_at = sync_run.started_at
+        customer_id = account.customer_id
+        db.execute(
+            update(SyncRun)
+            .where(SyncRun.id == sync_run_id)
+            .values(status=SyncStatus.SUCCESS, completed_at=completed_at, ads_synced=ads_count)
+        )
+        db.execute(
+            update(ConnectedAccount)
+            .where(ConnectedAccount.id == account_id)
+            .values(
+                last_sync_at=completed_at,
+                last_sync_status=SyncStatus.SUCCESS,
+                last_sync_error=None,
+            )
+        )
         db.commit()
 
         result = {
             "status": "success",
             "account_id": account_id,
-            "customer_id": account.customer_id,
+            "customer_id": customer_id,
             "ads_synced": ads_count,
             "keywords_synced": keywords_count,
-            "sync_run_id": sync_run.id,
-            "duration_seconds": (
-                sync_run.completed_at - sync_run.started_at
-            ).total_seconds(),
+            "sync_run_id": sync_run_id,
+            "duration_seconds": (completed_at - started_at).total_seconds(),
         }
 
         logger.info(f"Sync completed successfully for account {account_id}: {result}")
@@ -175,21 +259,44 @@ def sync_account_data(self, account_id: int, days: int = 90) -> dict:
     except Exception as e:
         logger.error(f"Sync failed for account {account_id}: {e}", exc_info=True)
 
-        # Update sync run with error
-        if sync_run:
-            sync_run.status = SyncStatus.FAILED
-            sync_run.completed_at = datetime.utcnow()
-            sync_run.error_message = str(e)
-            db.commit()
+        # Don't keep reusing a cached client after an API/auth failure
+        if client is not None and isinstance(e, (GoogleAdsException, RefreshError)):
+            evict_google_ads_client(client)
 
-        # Update account with error
-        if account:
-            account.last_sync_status = SyncStatus.FAILED
-            account.last_sync_error = str(e)
-            db.commit()
+        # Decide on the retry first so the lock handoff can't be skipped by a DB error below
+        retrying = self.request.retries < self.max_retries
+        if retrying:
+            # The retry keeps the account's sync lock
+            _extend_sync_lock(account_id, self.request.id)
+
+        # Record the error on the sync run and account in one transaction; the session
+        # may hold a failed transaction, so roll it back first
+        try:
+            db.rollback()
+            if sync_run:
+                db.execute(
+                    update(SyncRun)
+                    .where(SyncRun.id == sync_run.id)
+                    .values(
+                        status=SyncStatus.FAILED,
+                        completed_at=datetime.utcnow(),
+                        error_message=str(e),
+                    )
+                )
+            if account:
+                db.execute(
+                    update(ConnectedAccount)
+                    .where(ConnectedAccount.id == account_id)
+                    .values(last_sync_status=SyncStatus.FAILED, last_sync_error=str(e))
+                )
+            if sync_run or account:
+                db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception(f"Failed to record sync failure for account {account_id}")
 
         # Retry or fail
-        if self.request.retries < self.max_retries:
+        if retrying:
             logger.info(
                 f"Retrying sync for account {account_id} (attempt {self.request.retries + 1}/{self.max_retries})"
             )
@@ -204,6 +311,8 @@ def sync_account_data(self, account_id: int, days: int = 90) -> dict:
             }
 
     finally:
+        if not retrying:
+            release_sync_lock(account_id, self.request.id)
         db.close()
 
 
@@ -217,7 +326,7 @@ def schedule_all_account_syncs(self) -> dict:
     Schedule sync tasks for all active connected accounts.
 
     This runs nightly via Celery Beat and creates individual sync tasks.
-    Uses locking to prevent duplicate scheduled syncs.
+    Uses the per-account Redis sync lock to skip accounts already syncing.
     """
     db = get_sync_db()
 
@@ -238,38 +347,20 @@ def schedule_all_account_syncs(self) -> dict:
         scheduled_count = 0
         skipped_count = 0
         errors = []
+        to_schedule = []
 
         for account in accounts:
             try:
-                # Check if there's already a running sync for this account
-                recent_sync = (
-                    db.query(SyncRun)
-                    .filter(
-                        SyncRun.account_id == account.id,
-                        SyncRun.status == SyncStatus.RUNNING,
-                        SyncRun.started_at > datetime.utcnow() - timedelta(hours=2),
-                    )
-                    .first()
-                )
-
-                if recent_sync:
+                # Take the account's sync lock; held until the task's last attempt
+                task_id = uuid()
+                if not acquire_sync_lock(account.id, task_id):
                     logger.info(
                         f"Skipping account {account.id} ({account.customer_id}): sync already running"
                     )
                     skipped_count += 1
                     continue
 
-                # Schedule sync task
-                sync_account_data.apply_async(
-                    args=[account.id],
-                    kwargs={"days": 90},
-                    queue="sync",
-                )
-
-                scheduled_count += 1
-                logger.info(
-                    f"Scheduled sync for account {account.id} ({account.customer_id})"
-                )
+                to_schedule.append((account, task_id))
 
             except Exception as e:
                 logger.error(
@@ -278,6 +369,26 @@ def schedule_all_account_syncs(self) -> dict:
                 )
                 errors.append({"account_id": account.id, "error": str(e)})
 
+        if to_schedule:
+            # Publish all sync tasks in one batch instead of one round trip per account
+            job = group(
+                sync_account_data.s(account.id, days=90).set(task_id=task_id)
+                for account, task_id in to_schedule
+            )
+            try:
+                job.apply_async(queue="sync")
+            except Exception as e:
+                logger.error(f"Failed to schedule sync batch: {e}", exc_info=True)
+                for account, task_id in to_schedule:
+                    release_sync_lock(account.id, task_id)
+                    errors.append({"account_id": account.id, "error": str(e)})
+            else:
+                scheduled_count = len(to_schedule)
+                logger.info(
+                    "Scheduled sync for accounts: "
+                    + ", ".join(f"{a.id} ({a.customer_id})" for a, _ in to_schedule)
+                )
+
         result = {
             "status": "success",
             "accounts_scheduled": scheduled_count,
@@ -298,18 +409,25 @@ def schedule_all_account_syncs(self) -> dict:
 
 
 @celery_app.task(
-    bind=True,
-    name="app.worker.sync_account_on_demand",
-    time_limit=1800,  # 30 minutes
+    name="app.worker.build_exemplar_index_for_account",
+    time_limit=600,
 )
-def sync_account_on_demand(self, account_id: int) -> dict:
+def build_exemplar_index_for_account(account_id: int) -> dict:
     """
-    On-demand sync triggered by user action.
+    Build the exemplar index for an account outside of a full sync.
 
-    Similar to scheduled sync but with immediate execution priority.
+    Queued by /generate when an account has no index yet.
     """
-    logger.info(f"On-demand sync requested for account {account_id}")
-    return sync_account_data(account_id, days=90)
+    db = get_sync_db()
+    try:
+        index = build_exemplar_index(db, account_id)
+        return {
+            "status": "success",
+            "account_id": account_id,
+            "exemplars_indexed": len(index.ad_ids) if index else 0,
+        }
+    finally:
+        db.close()
 
 
 @celery_app.task(
@@ -7,20 +7,22 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import select
+
 from app.database import sync_engine, SyncSessionLocal
 from app.models import Base, User
 
 def init_db():
     """Create all tables and seed initial data."""
     print("Creating database tables...")
-    Base.metadata.create_all(bind=sync_engine)
+    Base.metadata.create_all(bind=sync_engine, checkfirst=True)
     print("✓ Tables created")
 
     # Create default user
     db = SyncSessionLocal()
     try:
-        existing_user = db.query(User).first()
-        if not existing_user:
+        existing_user_id = db.execute(select(User.id).limit(1)).scalar()
+        if existing_user_id is None:
             user = User(
                 email="default@example.com",
                 is_active=True,
@@ -29,7 +31,7 @@ def init_db():
             db.commit()
             print(f"✓ Created default user: {user.email}")
         else:
-            print(f"✓ Default user already exists: {existing_user.email}")
+            print(f"✓ A user already exists (id {existing_user_id})")
     finally:
         db.close()
 
@@ -0,0 +1,99 @@
+"""Tests for ad route query helpers."""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, insert, literal, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateTable
+
+from app.database import sync_engine
+from app.models import Ad
+from app.routes.ads import _keyset_page, _text_array
+
+
+@pytest.fixture(scope="module")
+def pg_connection():
+    """Connection to the configured Postgres; the JSONB functions need a real server."""
+    try:
+        connection = sync_engine.connect()
+    except OperationalError:
+        pytest.skip("PostgreSQL is not available")
+    yield connection
+    connection.close()
+
+
+class TestTextArray:
+    """Test asset text extraction in Postgres."""
+
+    def extract(self, connection, value):
+        return connection.execute(select(_text_array(literal(json.dumps(value))))).scalar()
+
+    def test_mixed_array_keeps_strings_and_textless_objects(self, pg_connection):
+        """Bare strings are kept and objects without "text" become empty strings."""
+        assets = [
+            {"text": "Free Trial", "pinned_field": "HEADLINE_1"},
+            "Plain Headline",
+            {"pinned_field": "HEADLINE_2"},
+        ]
+
+        texts = self.extract(pg_connection, assets)
+
+        assert texts == ["Free Trial", "Plain Headline", ""]
+
+    def test_empty_and_non_array_values(self, pg_connection):
+        """Empty arrays give [] and non-array documents give NULL."""
+        assert self.extract(pg_connection, []) == []
+        assert self.extract(pg_connection, {"text": "Not a list"}) is None
+
+
+class TestKeysetPage:
+    """Test keyset pagination over (bucket_score DESC NULLS LAST, id DESC)."""
+
+    @pytest.fixture(scope="class")
+    def connection(self):
+        """In-memory SQLite ads table; the cursor only needs row values and NULLS LAST."""
+        engine = create_engine("sqlite://")
+        scores = {1: 0.9, 2: 0.5, 3: 0.5, 4: None, 5: 0.5, 6: None, 7: 0.1, 8: None, 9: 0.9}
+        with engine.begin() as connection:
+            # Table only: SQLite can't build the NULLS LAST index
+            connection.execute(CreateTable(Ad.__table__))
+            connection.execute(
+                insert(Ad),
+                [
+                    {
+                        "id": ad_id,
+                        "ad_group_id": 1,
+                        "ad_id": str(ad_id),
+                        "ad_type": "RESPONSIVE_SEARCH_AD",
+                        "status": "ENABLED",
+                        "bucket_score": score,
+                    }
+                    for ad_id, score in scores.items()
+                ],
+            )
+        with engine.connect() as connection:
+            yield connection
+        engine.dispose()
+
+    def page(self, connection, limit, after_score=None, after_id=None):
+        query = _keyset_page(select(Ad.id, Ad.bucket_score), after_score, after_id)
+        return connection.execute(query.limit(limit)).all()
+
+    @pytest.mark.parametrize("limit", [1, 2, 3, 4])
+    def test_pages_cover_ordering_once(self, connection, limit):
+        """Walking the cursor visits every ad once, in order, across ties and NULL scores."""
+        expected = [9, 1, 5, 3, 2, 7, 8, 6, 4]
+
+        seen = []
+        rows = self.page(connection, limit)
+        while rows:
+            seen.extend(ad_id for ad_id, _ in rows)
+            last_id, last_score = rows[-1]
+            rows = self.page(connection, limit, last_score, last_id)
+
+        assert seen == expected
+
+    def test_id_only_cursor_stays_in_null_tail(self, connection):
+        """A cursor without a score continues within the NULL-score ads."""
+        assert [ad_id for ad_id, _ in self.page(connection, 10, after_id=6)] == [4]
@@ -0,0 +1,33 @@
+"""Tests for embedding similarity helpers."""
+
+import numpy as np
+
+from app.generation.embeddings import top_k_indices
+
+
+class TestTopKIndices:
+    """Test argpartition-based top-k selection."""
+
+    def test_matches_full_sort(self):
+        """The top-k indices are the first k of a full descending sort."""
+        scores = np.random.default_rng(3).random(100)
+
+        assert list(top_k_indices(scores, 7)) == list(np.argsort(-scores)[:7])
+
+    def test_k_larger_than_n_returns_all_best_first(self):
+        """Asking for more than there are returns every index in descending score order."""
+        scores = np.array([0.2, 0.9, -0.1, 0.5])
+
+        assert list(top_k_indices(scores, 10)) == [1, 3, 0, 2]
+        assert list(top_k_indices(scores, len(scores))) == [1, 3, 0, 2]
+
+    def test_ties_keep_index_order(self):
+        """Equal scores come back in index order."""
+        scores = np.array([0.5, 0.7, 0.5, 0.7])
+
+        assert list(top_k_indices(scores, 10)) == [1, 3, 0, 2]
+
+    def test_empty_inputs(self):
+        """No scores or a non-positive k select nothing."""
+        assert len(top_k_indices(np.empty(0), 5)) == 0
+        assert len(top_k_indices(np.array([0.1, 0.2]), 0)) == 0
@@ -0,0 +1,96 @@
+"""Tests for the int8 exemplar index."""
+
+import numpy as np
+import pytest
+
+from app.generation.exemplar_index import ExemplarIndex, quantize_int8
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestQuantizeInt8:
+    """Test per-row int8 quantization."""
+
+    def test_round_trip_error_within_half_a_step(self):
+        """Every component comes back within half of its row's quantization step."""
+        rng = np.random.default_rng(7)
+        vectors = normalize(rng.normal(size=(32, 256))).astype(np.float32)
+
+        codes, scales = quantize_int8(vectors)
+        restored = codes.astype(np.float32) * scales[:, None]
+
+        assert codes.dtype == np.int8
+        assert np.abs(codes).max() <= 127
+        assert np.all(np.abs(vectors - restored) <= scales[:, None] / 2 + 1e-6)
+
+    def test_zero_vector(self):
+        """An all-zero row quantizes to zeros without dividing by zero."""
+        vectors = np.array([[0.0, 0.0, 0.0], [0.6, -0.8, 0.0]], dtype=np.float32)
+
+        with np.errstate(all="raise"):
+            codes, scales = quantize_int8(vectors)
+
+        assert np.all(codes[0] == 0)
+        assert np.isfinite(scales).all()
+        assert np.allclose(codes[1] * scales[1], vectors[1], atol=scales[1] / 2)
+
+
+class TestExemplarIndexSearch:
+    """Test similarity search over the quantized rows."""
+
+    @pytest.fixture
+    def query(self):
+        """Unit query embedding."""
+        return normalize(np.random.default_rng(11).normal(size=(1, 128)))[0]
+
+    @pytest.fixture
+    def vectors(self, query):
+        """Unit rows whose cosine to the query is spread well apart, in shuffled order."""
+        rng = np.random.default_rng(13)
+        noise = rng.normal(size=(12, 128))
+        noise -= np.outer(noise @ query, query)
+        weights = np.linspace(0.95, -0.6, 12)
+        rows = weights[:, None] * query + np.sqrt(1 - weights**2)[:, None] * normalize(noise)
+        return rows[rng.permutation(12)].astype(np.float32)
+
+    def build(self, vectors):
+        codes, scales = quantize_int8(vectors)
+        return ExemplarIndex(
+            account_id=1,
+            ad_ids=np.arange(100, 100 + len(vectors), dtype=np.int64),
+            codes=codes,
+            scales=scales,
+        )
+
+    def test_ranks_like_float_cosine_similarity(self, vectors, query):
+        """The int8 index returns the same order and close scores as float cosine."""
+        index = self.build(vectors)
+        cosine = vectors @ query
+        expected_order = np.argsort(-cosine)
+
+        results = index.search(query * 3.0, top_k=len(vectors))
+
+        assert [ad_id for ad_id, _ in results] == [100 + int(i) for i in expected_order]
+        assert np.allclose([s for _, s in results], cosine[expected_order], atol=0.02)
+
+    def test_top_k_larger_than_index(self, vectors, query):
+        """Asking for more results than rows returns every row, best first."""
+        results = self.build(vectors).search(query, top_k=50)
+
+        scores = [s for _, s in results]
+        assert len(results) == len(vectors)
+        assert scores == sorted(scores, reverse=True)
+
+    def test_zero_query_and_empty_index(self, vectors):
+        """A zero query or an empty index returns no matches."""
+        assert self.build(vectors).search(np.zeros(vectors.shape[1])) == []
+
+        empty = ExemplarIndex(
+            account_id=1,
+            ad_ids=np.empty(0, dtype=np.int64),
+            codes=np.empty((0, 4), dtype=np.int8),
+            scales=np.empty(0, dtype=np.float32),
+        )
+        assert empty.search(np.ones(4)) == []
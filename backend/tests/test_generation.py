@@ -1,8 +1,10 @@
 """Tests for RSA generation and validation."""
 
+from types import SimpleNamespace
+
 import pytest
 
-from app.generation.generator import RSAGenerator, RSAConstraints, GeneratedRSA
+from app.generation.generator import GeneratedRSA, RSAConstraints, RSAGenerator, ValidationFlag
 from app.models import Ad
 
 
@@ -113,6 +115,26 @@ class TestRSAConstraints:
         assert len(rsa.descriptions[0]) <= 90
         assert not rsa.valid
 
+    def test_parsed_copy_replaces_tabs_without_failing_validation(self, generator):
+        """Tabs inside generated lines become single spaces while parsing, not flagged."""
+        generated = (
+            "VARIANT 1\n"
+            "HEADLINES:\n"
+            "- Free\tTrial\n"
+            "- Two\n"
+            "- Three\n"
+            "DESCRIPTIONS:\n"
+            "- Sign up\r today\n"
+            "- Normal description\n"
+        )
+
+        (rsa,) = generator._parse_response(generated, [], expected_variants=1)
+        generator._validate_rsa(rsa)
+
+        assert rsa.headlines[0] == "Free Trial"
+        assert rsa.descriptions[0] == "Sign up today"
+        assert rsa.valid
+
     def test_duplicate_headlines_fail(self, generator):
         """Duplicate headlines should fail uniqueness check."""
         rsa = GeneratedRSA(
@@ -145,6 +167,27 @@ class TestRSAConstraints:
         assert not rsa.valid
         assert any("duplicates" in err.lower() for err in rsa.validation_errors)
 
+    def test_error_flags_track_violations(self, generator):
+        """Each kind of violation should set its flag, in check order."""
+        rsa = GeneratedRSA(
+            headlines=["Same", "Same"],
+            descriptions=["Description 1", "Description 2"],
+            prompt_version="v1.0",
+            model_used="gpt-4o-mini",
+            exemplar_ids=[1],
+            similarity_scores=[0.9],
+        )
+
+        generator._validate_rsa(rsa)
+
+        assert rsa.error_flags == (
+            ValidationFlag.TOO_FEW_HEADLINES | ValidationFlag.DUPLICATE_HEADLINES
+        )
+        assert rsa.validation_errors == [
+            "Too few headlines: 2 < 3",
+            "Headlines contain duplicates: 'Same'",
+        ]
+
     def test_minimum_requirements_met(self, generator):
         """Minimum 3 headlines and 2 descriptions."""
         rsa = GeneratedRSA(
@@ -170,7 +213,7 @@ class TestRSAPromptBuilder:
         """Create RSA generator."""
         return RSAGenerator()
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def target_ad(self):
         """Target ad for improvement."""
         return Ad(
@@ -189,7 +232,7 @@ class TestRSAPromptBuilder:
             ],
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def exemplar_ads(self):
         """High-performing exemplar ads."""
         ad1 = Ad(
@@ -246,8 +289,107 @@ class TestRSAPromptBuilder:
         assert "90 characters" in prompt.lower() or "90-char" in prompt.lower()
         assert "unique" in prompt.lower()
 
+    def test_assets_without_text_do_not_break_prompt(self, generator, exemplar_ads):
+        """Asset dicts missing "text" (e.g. pin-only entries) render as empty copy."""
+        ad = Ad(
+            id=2,
+            ad_id="456",
+            ad_type="RESPONSIVE_SEARCH_AD",
+            status="ENABLED",
+            headlines=[{"text": "Kept Headline"}, {"pinned_field": "HEADLINE_1"}],
+            descriptions=[{"pinned_field": "DESCRIPTION_1"}],
+        )
+
+        prompt = generator._build_prompt(ad, exemplar_ads, num_variants=3)
+
+        assert "Kept Headline" in prompt
+
     def test_prompt_specifies_variant_count(self, generator, target_ad, exemplar_ads):
         """Prompt should request correct number of variants."""
         prompt = generator._build_prompt(target_ad, exemplar_ads, num_variants=5)
 
         assert "5" in prompt or "five" in prompt.lower()
+
+
+class TestRSABatchGeneration:
+    """Test batched generation across several target ads."""
+
+    @pytest.fixture
+    def generator(self):
+        """Create RSA generator."""
+        return RSAGenerator()
+
+    @pytest.fixture
+    def tasks(self):
+        """Two target ads sharing one exemplar."""
+        exemplar = Ad(
+            id=10,
+            ad_id="ex1",
+            ad_type="RSA",
+            status="ENABLED",
+            headlines=[{"text": "Best Phone System"}],
+            descriptions=[{"text": "Cloud-based business phone."}],
+        )
+        target1 = Ad(
+            id=1,
+            ad_id="1",
+            ad_type="RSA",
+            status="ENABLED",
+            headlines=[{"text": "Old Headline A"}],
+            descriptions=[],
+        )
+        target2 = Ad(
+            id=2,
+            ad_id="2",
+            ad_type="RSA",
+            status="ENABLED",
+            headlines=[{"text": "Old Headline B"}],
+            descriptions=[],
+        )
+        return [(target1, [(exemplar, 0.9)]), (target2, [(exemplar, 0.8)])]
+
+    def test_batch_prompt_has_one_task_per_ad(self, generator, tasks):
+        """Batch prompt should wrap each target ad in its own task block."""
+        prompt = generator._build_batch_prompt(tasks, num_variants=2)
+
+        assert '<task id="1">' in prompt
+        assert '<task id="2">' in prompt
+        assert "Old Headline A" in prompt
+        assert "Old Headline B" in prompt
+        assert prompt.count("**Strict Constraints:**") == 1
+
+    def test_batch_prompt_renders_shared_exemplar_once(self, generator, tasks):
+        """An exemplar shared by several tasks should appear once, referenced by label."""
+        prompt = generator._build_batch_prompt(tasks, num_variants=2)
+
+        assert prompt.count("Best Phone System") == 1
+        assert "E1 (similarity: 0.90)" in prompt
+        assert "E1 (similarity: 0.80)" in prompt
+
+    def test_generate_batch_splits_outputs_per_ad(self, generator, tasks):
+        """One completion should be parsed back into per-ad suggestions."""
+        variant = (
+            "VARIANT 1\nHEADLINES:\n- One\n- Two\n- Three\n"
+            "DESCRIPTIONS:\n- Description 1\n- Description 2\n"
+        )
+        content = f'<output id="1">\n{variant}</output>\n<output id="2">\n{variant}</output>'
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+            )
+
+        generator.client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+
+        results = generator.generate_batch(
+            [ad for ad, _ in tasks], [ex for _, ex in tasks], num_variants=1
+        )
+
+        assert len(calls) == 1
+        assert set(results) == {1, 2}
+        assert results[1][0].headlines == ["One", "Two", "Three"]
+        assert results[2][0].valid
@@ -3,22 +3,27 @@
 import pytest
 from datetime import datetime
 
-from app.analysis.scoring import compute_ad_score, ScoringConfig, AdBucket
+from app.analysis.scoring import (
+    compute_ad_score,
+    compute_ad_scores_batch,
+    ScoringConfig,
+    AdBucket,
+)
 from app.models import Ad, AdMetrics90d
 
 
 class TestAdScoring:
     """Test suite for ad scoring algorithm."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def config(self):
-        """Default scoring config."""
+        """Default scoring config (frozen, so safe to share)."""
         return ScoringConfig(
             min_impressions=100,
             min_clicks=10,
         )
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def high_performing_ad(self):
         """Create a high-performing ad with metrics."""
         ad = Ad(
@@ -45,7 +50,7 @@ class TestAdScoring:
 
         return ad, metrics
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def low_performing_ad(self):
         """Create a low-performing ad with metrics."""
         ad = Ad(
@@ -182,6 +187,27 @@ class TestAdScoring:
         # Ad2 should score higher due to volume component
         assert score2.score > score1.score
 
+    def test_batch_scores_match_single_ad_scores(
+        self, high_performing_ad, low_performing_ad, config
+    ):
+        """Vectorized batch scoring should agree with per-ad scoring."""
+        pairs = [high_performing_ad, low_performing_ad]
+        metrics = [m for _, m in pairs]
+
+        batch = compute_ad_scores_batch(
+            [m.impressions for m in metrics] + [50],  # Last one below min_impressions
+            [m.clicks for m in metrics] + [5],
+            [m.ctr for m in metrics] + [None],
+            [m.conversion_rate for m in metrics] + [None],
+            [m.cost_per_conversion for m in metrics] + [None],
+            config,
+        )
+
+        for i, (ad, m) in enumerate(pairs):
+            assert batch.score[i] == pytest.approx(compute_ad_score(ad, m, config).score)
+        assert batch.score[2] == 0.0
+        assert not batch.meets_impressions[2]
+
     def test_scoring_weights_sum_to_one(self, config):
         """Scoring weights should sum to 1.0."""
         total_weight = (
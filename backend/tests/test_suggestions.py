@@ -0,0 +1,62 @@
+"""Tests for stored suggestion validation."""
+
+import pytest
+
+from app.generation.generator import RSAConstraints
+from app.routes.suggestions import _validate_suggestion_copies
+
+
+def validate_one(headlines: list[str], descriptions: list[str]) -> list[str]:
+    """Reference per-suggestion checks, in the order the listing reports them."""
+    c = RSAConstraints()
+    errors = []
+    if len(headlines) < c.min_headlines:
+        errors.append(f"Too few headlines: {len(headlines)} < {c.min_headlines}")
+    if len(headlines) > c.max_headlines:
+        errors.append(f"Too many headlines: {len(headlines)} > {c.max_headlines}")
+    if len(descriptions) < c.min_descriptions:
+        errors.append(f"Too few descriptions: {len(descriptions)} < {c.min_descriptions}")
+    if len(descriptions) > c.max_descriptions:
+        errors.append(f"Too many descriptions: {len(descriptions)} > {c.max_descriptions}")
+    for i, h in enumerate(headlines):
+        if len(h) > c.max_headline_length:
+            errors.append(f"Headline {i + 1} too long: {len(h)} > {c.max_headline_length}")
+    for i, d in enumerate(descriptions):
+        if len(d) > c.max_description_length:
+            errors.append(
+                f"Description {i + 1} too long: {len(d)} > {c.max_description_length}"
+            )
+    return errors
+
+
+class TestValidateSuggestionCopies:
+    """Test the vectorized validation against per-suggestion checks."""
+
+    @pytest.fixture
+    def copies(self):
+        """Suggestions with mixed counts and lengths, including empty lists."""
+        return [
+            (["Short", "Also short", "Third"], ["Fine description", "Another one"]),
+            ([], []),
+            (["H" * 31, "Ok", "X" * 40], []),
+            (["Only one"], ["D" * 91, "Fine", "E" * 100]),
+            ([f"Headline {i}" for i in range(16)], ["a", "b", "c", "d", "e"]),
+            ([], ["D" * 95]),
+            (["Ok", "Ok too", "Z" * 30], ["Q" * 90, "Fine"]),
+        ]
+
+    def test_matches_per_suggestion_loop(self, copies):
+        """Every suggestion gets the same errors, in the same order, as the loop."""
+        expected = [validate_one(h, d) for h, d in copies]
+
+        assert _validate_suggestion_copies(copies) == expected
+
+    def test_single_suggestions_match_batch(self, copies):
+        """Validating one suggestion at a time gives the same result as the batch."""
+        batch = _validate_suggestion_copies(copies)
+
+        assert [_validate_suggestion_copies([copy])[0] for copy in copies] == batch
+
+    def test_empty_batch(self):
+        """No suggestions means no error lists."""
+        assert _validate_suggestion_copies([]) == []